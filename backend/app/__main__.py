@@ -1,16 +1,46 @@
 from __future__ import annotations
 
+import importlib.util
+import inspect
 import os
 
 import uvicorn
 
 
+def _available(module: str, fallback: str) -> str:
+    return module if importlib.util.find_spec(module) else fallback
+
+
 def main() -> None:
+    """Run the API with uvicorn.
+
+    ``WEB_CONCURRENCY`` worker processes share one listening socket; each worker
+    runs uvloop and httptools when installed (``uvicorn[standard]``). Workers are
+    restarted after ``SERVER_MAX_REQUESTS`` requests to bound memory growth, and on
+    SIGTERM in-flight requests get ``SERVER_GRACEFUL_TIMEOUT_SECONDS`` to finish.
+    """
+    reload = os.getenv("RELOAD", "false").lower() == "true"
+    workers = 1 if reload else max(int(os.getenv("WEB_CONCURRENCY", "1")), 1)
+    max_requests = int(os.getenv("SERVER_MAX_REQUESTS", "0"))
+    options = {}
+    if max_requests and "limit_max_requests_jitter" in inspect.signature(uvicorn.Config).parameters:
+        # Keep workers started together from all recycling at the same moment.
+        options["limit_max_requests_jitter"] = max_requests // 10
+
     uvicorn.run(
         "app.main:app",
         host=os.getenv("HOST", "0.0.0.0"),
         port=int(os.getenv("PORT", "8000")),
-        reload=os.getenv("RELOAD", "false").lower() == "true",
+        reload=reload,
+        workers=workers,
+        loop=_available("uvloop", "asyncio"),
+        http=_available("httptools", "h11"),
+        backlog=int(os.getenv("SERVER_BACKLOG", "2048")),
+        timeout_keep_alive=int(os.getenv("SERVER_KEEP_ALIVE_SECONDS", "15")),
+        limit_max_requests=max_requests or None,
+        timeout_graceful_shutdown=int(os.getenv("SERVER_GRACEFUL_TIMEOUT_SECONDS", "600")),
+        access_log=os.getenv("SERVER_ACCESS_LOG", "true").lower() == "true",
+        **options,
     )
 
 
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Fast settings suited to compressing dynamic responses on every request. gzip
+# level 4 is ~3x faster than the default 6 on transcripts for ~5% more bytes.
+GZIP_LEVEL = 4
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-subrip",
+    "application/javascript",
+    "application/xml",
+)
+
+# Whole bodies above this size are compressed in a worker thread (zlib, brotli and
+# zstandard release the GIL) instead of blocking the event loop.
+THREAD_THRESHOLD = 64 * 1024
+
+
+class _Stream:
+    """Incremental compressor: ``compress`` for each chunk, ``finish`` once at the end."""
+
+    def __init__(self, compress: Callable[[bytes], bytes], finish: Callable[[], bytes]) -> None:
+        self.compress = compress
+        self.finish = finish
+
+
+@dataclass(frozen=True)
+class Encoder:
+    name: str
+    stream: Callable[[], _Stream]
+
+
+def _gzip() -> _Stream:
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return _Stream(compressor.compress, compressor.flush)
+
+
+def _brotli_encoder() -> Optional[Encoder]:
+    try:
+        brotli = importlib.import_module("brotli")
+    except ImportError:
+        return None
+
+    def stream() -> _Stream:
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return _Stream(compressor.process, compressor.finish)
+
+    return Encoder("br", stream)
+
+
+def _zstd_encoder() -> Optional[Encoder]:
+    try:
+        zstandard = importlib.import_module("zstandard")
+    except ImportError:
+        return None
+
+    def stream() -> _Stream:
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        return _Stream(compressor.compress, compressor.flush)
+
+    return Encoder("zstd", stream)
+
+
+_LOADERS: Dict[str, Callable[[], Optional[Encoder]]] = {
+    "zstd": _zstd_encoder,
+    "br": _brotli_encoder,
+    "gzip": lambda: Encoder("gzip", _gzip),
+}
+
+
+def load_encoders(names: Sequence[str]) -> List[Encoder]:
+    """Return the usable encoders among ``names``, in the server's order of preference.
+
+    ``br`` and ``zstd`` need the optional ``brotli`` and ``zstandard`` packages and
+    are skipped when those are not installed.
+    """
+    encoders = []
+    for name in names:
+        loader = _LOADERS.get(name)
+        encoder = loader() if loader else None
+        if encoder is not None:
+            encoders.append(encoder)
+    return encoders
+
+
+def negotiate(accept_encoding: str, encoders: Sequence[Encoder]) -> Optional[Encoder]:
+    """Pick the encoder with the highest ``Accept-Encoding`` q-value.
+
+    Ties go to the server's preference order; ``*`` covers encodings the client did
+    not list, and ``q=0`` rules an encoding out.
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+
+    best: Optional[Tuple[float, Encoder]] = None
+    for encoder in encoders:
+        weight = weights.get(encoder.name, weights.get("*", 0.0))
+        if weight > 0 and (best is None or weight > best[0]):
+            best = (weight, encoder)
+    return best[1] if best else None
+
+
+class CompressionMiddleware:
+    """Negotiated gzip / brotli / zstd compression for JSON and text responses.
+
+    Bodies smaller than ``minimum_size`` are sent as-is. Streaming responses (such
+    as ``/download-transcript``) are compressed chunk by chunk with the
+    ``Content-Length`` dropped, once the buffered start of the body reaches the
+    threshold.
+    """
+
+    def __init__(
+        self, app: ASGIApp, encodings: Sequence[str] = ("zstd", "br", "gzip"), minimum_size: int = 1024
+    ) -> None:
+        self.app = app
+        self.encoders = load_encoders(encodings)
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.encoders:
+            await self.app(scope, receive, send)
+            return
+        encoder = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encoders)
+        if encoder is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressedResponder(send, encoder, self.minimum_size)
+        await self.app(scope, receive, responder.send_wrapper)
+
+
+class _CompressedResponder:
+    def __init__(self, send: Send, encoder: Encoder, minimum_size: int) -> None:
+        self.send = send
+        self.encoder = encoder
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.buffer: List[bytes] = []
+        self.buffered = 0
+        self.stream: Optional[_Stream] = None
+        self.passthrough = False
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or message.get("status", 200) in (204, 304)
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+                self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.stream is not None:
+            await self._send_compressed(body, more_body)
+            return
+
+        self.buffer.append(body)
+        self.buffered += len(body)
+        if more_body and self.buffered < self.minimum_size:
+            return
+        if not more_body and self.buffered < self.minimum_size:
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": b"".join(self.buffer)})
+            return
+
+        self.stream = self.encoder.stream()
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers["Content-Encoding"] = self.encoder.name
+        pending = b"".join(self.buffer)
+        self.buffer = []
+        if not more_body:
+            if len(pending) > THREAD_THRESHOLD:
+                compressed = await asyncio.to_thread(_compress_all, self.stream, pending)
+            else:
+                compressed = _compress_all(self.stream, pending)
+            headers["Content-Length"] = str(len(compressed))
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": compressed})
+            return
+        del headers["Content-Length"]
+        await self.send(self.start)
+        await self._send_compressed(pending, more_body=True)
+
+    async def _send_compressed(self, body: bytes, more_body: bool) -> None:
+        assert self.stream is not None
+        chunk = self.stream.compress(body) if body else b""
+        if not more_body:
+            chunk += self.stream.finish()
+        if chunk or not more_body:
+            await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+
+def _compress_all(stream: _Stream, body: bytes) -> bytes:
+    return stream.compress(body) + stream.finish()
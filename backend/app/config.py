@@ -28,19 +28,68 @@ class Settings(BaseSettings):
     # Transcription provider: "openai" or "assemblyai"
     transcription_provider: str = Field(default="openai", alias="TRANSCRIPTION_PROVIDER")
 
+    transcription_failover: bool = os.getenv("TRANSCRIPTION_FAILOVER", "true").lower() == "true"
+    transcription_hedge: bool = os.getenv("TRANSCRIPTION_HEDGE", "false").lower() == "true"
+    transcription_hedge_percentile: float = float(os.getenv("TRANSCRIPTION_HEDGE_PERCENTILE", "0.95"))
+    transcription_hedge_min_delay_seconds: float = float(
+        os.getenv("TRANSCRIPTION_HEDGE_MIN_DELAY_SECONDS", "20")
+    )
+    transcription_hedge_default_delay_seconds: float = float(
+        os.getenv("TRANSCRIPTION_HEDGE_DEFAULT_DELAY_SECONDS", "120")
+    )
+    circuit_breaker_failures: int = int(os.getenv("CIRCUIT_BREAKER_FAILURES", "3"))
+    circuit_breaker_cooldown_seconds: float = float(
+        os.getenv("CIRCUIT_BREAKER_COOLDOWN_SECONDS", "60")
+    )
+
     stt_model: str = os.getenv("STT_MODEL_NAME", "gpt-4o-transcription")
     assembly_model: str = os.getenv("ASSEMBLYAI_SPEECH_MODEL", "universal")
+    assemblyai_speaker_labels: bool = (
+        os.getenv("ASSEMBLYAI_SPEAKER_LABELS", "false").lower() == "true"
+    )
     summary_model_name: str = os.getenv("SUMMARY_MODEL_NAME", "gpt-4o-mini")
     summary_chunk_words: int = int(os.getenv("SUMMARY_CHUNK_WORDS", "1200"))
     summary_max_tokens: int = int(os.getenv("SUMMARY_MAX_TOKENS", "300"))
     youtube_audio_format: str = os.getenv("YOUTUBE_AUDIO_FORMAT", "bestaudio/best")
+    youtube_playlist_max_items: int = int(os.getenv("YOUTUBE_PLAYLIST_MAX_ITEMS", "50"))
+    youtube_playlist_concurrency: int = int(os.getenv("YOUTUBE_PLAYLIST_CONCURRENCY", "4"))
+    youtube_max_download_rate_kbps: int = int(os.getenv("YOUTUBE_MAX_DOWNLOAD_RATE_KBPS", "0"))
     session_ttl_minutes: int = int(os.getenv("SESSION_TTL_MINUTES", "240"))
+    session_max_records: int = int(os.getenv("SESSION_MAX_RECORDS", "0"))
+    session_store_path: str = os.getenv("SESSION_STORE_PATH", "")
+    search_enabled: bool = os.getenv("SEARCH_ENABLED", "true").lower() == "true"
+    compression_encodings: str = os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip")
+    compression_min_bytes: int = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
     cors_allow_origins: List[str] = Field(
         default_factory=lambda: _parse_origins(os.getenv("CORS_ALLOW_ORIGINS"))
     )
     temp_dir: str = os.getenv("TRANSCRIPTION_TEMP_DIR", "")
+    temp_storage_quota_mb: int = int(os.getenv("TEMP_STORAGE_QUOTA_MB", "5120"))
+    temp_storage_min_free_mb: int = int(os.getenv("TEMP_STORAGE_MIN_FREE_MB", "512"))
+    temp_memory_dir: str = os.getenv("TRANSCRIPTION_MEMORY_TEMP_DIR", "")
+    temp_memory_quota_mb: int = int(os.getenv("TEMP_MEMORY_QUOTA_MB", "256"))
+    temp_memory_max_file_mb: int = int(os.getenv("TEMP_MEMORY_MAX_FILE_MB", "25"))
+    temp_orphan_max_age_minutes: int = int(os.getenv("TEMP_ORPHAN_MAX_AGE_MINUTES", "60"))
+    temp_sweep_interval_seconds: int = int(os.getenv("TEMP_SWEEP_INTERVAL_SECONDS", "300"))
+    temp_storage_retry_after_seconds: int = int(os.getenv("TEMP_STORAGE_RETRY_AFTER_SECONDS", "30"))
+    youtube_download_estimate_mb: int = int(os.getenv("YOUTUBE_DOWNLOAD_ESTIMATE_MB", "100"))
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    warm_up_providers: bool = os.getenv("WARM_UP_PROVIDERS", "true").lower() == "true"
     max_upload_size_mb: int = int(os.getenv("MAX_UPLOAD_SIZE_MB", "200"))
+    upload_max_chunk_mb: int = int(os.getenv("UPLOAD_MAX_CHUNK_MB", "16"))
+    upload_session_ttl_minutes: int = int(os.getenv("UPLOAD_SESSION_TTL_MINUTES", "60"))
     request_timeout_seconds: float = float(os.getenv("REQUEST_TIMEOUT_SECONDS", "600"))
+    shutdown_drain_seconds: float = float(os.getenv("SHUTDOWN_DRAIN_SECONDS", "0"))
+    admission_upload_limit: int = int(os.getenv("ADMISSION_UPLOAD_LIMIT", "8"))
+    admission_download_limit: int = int(os.getenv("ADMISSION_DOWNLOAD_LIMIT", "4"))
+    admission_stt_limit: int = int(os.getenv("ADMISSION_STT_LIMIT", "8"))
+    admission_summary_limit: int = int(os.getenv("ADMISSION_SUMMARY_LIMIT", "8"))
+    admission_upload_seconds: float = float(os.getenv("ADMISSION_UPLOAD_SECONDS", "5"))
+    admission_download_seconds: float = float(os.getenv("ADMISSION_DOWNLOAD_SECONDS", "30"))
+    admission_stt_seconds: float = float(os.getenv("ADMISSION_STT_SECONDS", "60"))
+    admission_summary_seconds: float = float(os.getenv("ADMISSION_SUMMARY_SECONDS", "15"))
+    admission_max_wait_seconds: float = float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", "120"))
+    admission_max_queue: int = int(os.getenv("ADMISSION_MAX_QUEUE", "32"))
+    admission_priority_limit: int = int(os.getenv("ADMISSION_PRIORITY_LIMIT", "32"))
 
 settings = Settings()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import AsyncGenerator, Optional, Tuple
+
+from starlette.datastructures import FormData, Headers
+from starlette.formparsers import MultiPartException, MultiPartParser
+from starlette.requests import Request
+
+from .services import TempLease
+
+
+class LeaseMultiPartParser(MultiPartParser):
+    """Multipart parser that writes the uploaded file straight into a temp lease.
+
+    Starlette spools file parts over 1 MB to the system temp directory, which is
+    outside the managed root and its quota, and the file then had to be copied
+    into the lease a second time. Here the file part is written to the lease as it
+    arrives and the size limit is enforced while reading.
+    """
+
+    def __init__(
+        self,
+        headers: Headers,
+        stream: AsyncGenerator[bytes, None],
+        lease: TempLease,
+        max_file_bytes: int,
+    ) -> None:
+        super().__init__(headers, stream, max_files=1, max_fields=100)
+        self.lease = lease
+        self.max_file_bytes = max_file_bytes
+        self.path: Optional[Path] = None
+        self._file_bytes = 0
+
+    def on_headers_finished(self) -> None:
+        super().on_headers_finished()
+        upload = self._current_part.file
+        if upload is None:
+            return
+        upload.file.close()
+        self.path = self.lease.new_file(Path(upload.filename or "").suffix or ".mp3")
+        upload.file = self.path.open("w+b")
+        self._files_to_close_on_error.append(upload.file)
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._current_part.file is not None:
+            self._file_bytes += end - start
+            if self._file_bytes > self.max_file_bytes:
+                raise MultiPartException(
+                    f"File exceeds maximum size of {self.max_file_bytes / (1024 * 1024):.0f} MB"
+                )
+        super().on_part_data(data, start, end)
+
+
+async def parse_upload_form(
+    request: Request, lease: TempLease, max_file_bytes: int
+) -> Tuple[FormData, Optional[Path]]:
+    """Parse a multipart upload, returning its fields and where the file was stored.
+
+    Raises ``MultiPartException`` for malformed or oversized bodies.
+    """
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise MultiPartException("Expected a multipart/form-data body.")
+    parser = LeaseMultiPartParser(request.headers, request.stream(), lease, max_file_bytes)
+    form = await parser.parse()
+    return form, parser.path
@@ -1,38 +1,273 @@
 from __future__ import annotations
 
-import io
+import asyncio
+import importlib
 import logging
-from pathlib import Path
+import signal
+import threading
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from functools import wraps
+from typing import AsyncIterator, Callable, Literal, TypeVar
 
-from fastapi import FastAPI, File, Form, HTTPException, Query, Request, UploadFile, status
+from fastapi import FastAPI, HTTPException, Query, Request, status
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import ValidationError
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException
 
+from .compression import CompressionMiddleware
 from .config import settings
+from .forms import parse_upload_form
 from .models import (
     ErrorResponse,
+    PlaylistItemResult,
+    PlaylistTranscriptionResponse,
+    ResumableUploadCreateRequest,
+    ResumableUploadFinalizeRequest,
+    ResumableUploadStatus,
+    SearchHit,
+    SearchResponse,
     TranscriptionOptions,
     TranscriptionResponse,
+    UploadSegmentStatus,
+    YouTubePlaylistTranscriptionRequest,
     YouTubeTranscriptionRequest,
 )
 from .options import RequestOptions
+from .serialization import FastJSONResponse, trusted_response
 from .services import (
+    AdmissionController,
+    AdmissionRejected,
+    AdmissionTicket,
     AssemblyAIClientProvider,
     OpenAIClientProvider,
+    PlaylistEntry,
+    ProviderRouter,
+    ResumableUploadService,
+    SearchIndex,
+    SegmentedTranscript,
     SessionStore,
+    SqliteSessionStore,
+    StorageQuotaExceeded,
     SummarizationService,
+    TempLease,
+    TempStorageManager,
     TranscriptionError,
     TranscriptionService,
+    UploadConflict,
+    UploadNotFound,
+    UploadStatus,
     YouTubeAudioService,
+    parse_content_range,
 )
 
 logger = logging.getLogger("transcription-app")
 logging.basicConfig(level=settings.log_level)
 
+# Provider SDKs are imported on first use; warming them up here moves that cost off
+# the first request without delaying startup or the health probe.
+_WARM_UP_MODULES = ("openai", "assemblyai", "yt_dlp", "yt_dlp.extractor.extractors")
+_providers_ready = asyncio.Event()
+# Set on SIGTERM: health checks fail and new transcription work is turned away while
+# in-flight requests finish, so a load balancer can move traffic to other workers.
+_draining = asyncio.Event()
+
+
+def _warm_up_providers() -> None:
+    for module in _WARM_UP_MODULES:
+        try:
+            importlib.import_module(module)
+        except Exception:  # pragma: no cover - optional dependency missing or broken
+            logger.warning("Failed to preload %s", module, exc_info=True)
+    get_transcription_service()
+    get_summarization_service()
+    get_session_store()
+    get_youtube_service()
+
+
+async def _sweep_temp_storage_periodically() -> None:
+    interval = max(settings.temp_sweep_interval_seconds, 1)
+    while True:
+        try:
+            await get_upload_service().expire()
+            await asyncio.to_thread(get_temp_storage().sweep_orphans)
+        except Exception:
+            logger.exception("Temp storage sweep failed")
+        await asyncio.sleep(interval)
+
+
+def _install_drain_handler() -> None:
+    """Delay uvicorn's SIGTERM handling by ``SHUTDOWN_DRAIN_SECONDS`` while draining.
+
+    uvicorn installs its own handler before the lifespan starts; it is chained here
+    and runs once the drain window is over (or right away on a second SIGTERM).
+    uvicorn then stops accepting connections and waits for in-flight requests.
+    """
+    if settings.shutdown_drain_seconds <= 0:
+        return
+    if threading.current_thread() is not threading.main_thread():
+        return
+    previous = signal.getsignal(signal.SIGTERM)
+    if not callable(previous):
+        return
+    loop = asyncio.get_running_loop()
+
+    def handle_sigterm(signum, frame) -> None:
+        if _draining.is_set():
+            previous(signum, frame)
+            return
+        logger.info("SIGTERM received; draining for %.0fs", settings.shutdown_drain_seconds)
+        _draining.set()
+        loop.call_later(settings.shutdown_drain_seconds, previous, signum, frame)
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    warm_up: asyncio.Task[None] | None = None
+    if settings.warm_up_providers:
+        warm_up = asyncio.create_task(asyncio.to_thread(_warm_up_providers))
+        warm_up.add_done_callback(lambda _: _providers_ready.set())
+    else:
+        _providers_ready.set()
+    sweeper = asyncio.create_task(_sweep_temp_storage_periodically())
+    _install_drain_handler()
+    try:
+        yield
+    finally:
+        _draining.set()
+        sweeper.cancel()
+        await get_upload_service().drain(timeout=settings.request_timeout_seconds)
+        if warm_up and not warm_up.done():
+            warm_up.cancel()
+
+
 app = FastAPI(
     title="Transcription API",
     version="1.0.0",
     description="Speech-to-text transcription and summarization service.",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
+
+_TEMP_STORAGE_ROUTES = {"/upload-audio", "/youtube-transcribe", "/youtube-playlist-transcribe"}
+# Routes whose temp space is reserved up front, mapped to their lease owner prefix.
+# Playlists reserve space per video as each download starts.
+_TEMP_LEASE_OWNERS = {"/upload-audio": "upload", "/youtube-transcribe": "youtube"}
+
+
+@app.middleware("http")
+async def temp_storage_admission(request: Request, call_next):
+    """Reserve temp storage before the body is read; reject the request if it is full.
+
+    The lease is handed to the route as ``request.state.temp_lease`` and released
+    here once the response has been produced, whatever the route did with it.
+    """
+    path = request.url.path
+    if request.method != "POST" or path not in _TEMP_STORAGE_ROUTES:
+        return await call_next(request)
+    storage = get_temp_storage()
+    lease: TempLease | None = None
+    try:
+        if path in _TEMP_LEASE_OWNERS:
+            lease = await asyncio.to_thread(
+                storage.acquire,
+                f"{_TEMP_LEASE_OWNERS[path]}-{uuid.uuid4().hex}",
+                expected_temp_bytes(request),
+            )
+        else:
+            await asyncio.to_thread(storage.check_admission, expected_temp_bytes(request))
+    except StorageQuotaExceeded as exc:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": str(exc)},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+    request.state.temp_lease = lease
+    try:
+        return await call_next(request)
+    finally:
+        if lease:
+            await asyncio.to_thread(lease.release)
+
+
+# Work classes each route passes through; the admission controller sheds requests
+# whose expected wait across these classes is too long.
+_ROUTE_WORK = {
+    "/upload-audio": ("upload", "stt", "summarization"),
+    "/youtube-transcribe": ("download", "stt", "summarization"),
+    "/youtube-playlist-transcribe": ("download", "stt", "summarization"),
+}
+_PRIORITY_ROUTES = {"/download-transcript", "/search"}
+
+
+def _route_work(method: str, path: str) -> tuple[str, ...] | None:
+    if method == "POST" and path in _ROUTE_WORK:
+        return _ROUTE_WORK[path]
+    if path.startswith("/uploads/"):
+        # Chunks only pay for the upload stage; early segment transcription and
+        # finalize go through the STT stage themselves.
+        if method == "PUT":
+            return ("upload",)
+        if method == "POST" and path.endswith("/finalize"):
+            return ("stt", "summarization")
+    return None
+
+
+@app.middleware("http")
+async def load_shedding(request: Request, call_next):
+    """Answer with 429/503 and Retry-After as soon as the expected wait is too long."""
+    path = request.url.path
+    work = _route_work(request.method, path)
+    if work is None and path not in _PRIORITY_ROUTES:
+        return await call_next(request)
+    if work and _draining.is_set():
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Server is shutting down; please retry."},
+            headers={"Retry-After": "1", "Connection": "close"},
+        )
+
+    controller = get_admission_controller()
+    try:
+        ticket = controller.admit(work) if work else controller.admit_priority()
+    except AdmissionRejected as exc:
+        logger.warning("Shedding %s %s: %s", request.method, path, exc)
+        return JSONResponse(
+            status_code=exc.status_code,
+            content={"detail": str(exc)},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+    try:
+        response = await call_next(request)
+    except BaseException:
+        ticket.release()
+        raise
+    # ``call_next`` returns as soon as the response starts; streamed downloads keep
+    # their slot until the last chunk is sent.
+    response.body_iterator = _release_after(response.body_iterator, ticket)
+    return response
+
+
+async def _release_after(
+    body: AsyncIterator[bytes], ticket: AdmissionTicket
+) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        ticket.release()
+
+
+app.add_middleware(
+    CompressionMiddleware,
+    encodings=[name.strip() for name in settings.compression_encodings.split(",") if name.strip()],
+    minimum_size=settings.compression_min_bytes,
 )
 
 cors_allow_origins = settings.cors_allow_origins or ["*"]
@@ -45,25 +280,168 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-client_provider = OpenAIClientProvider()
-assembly_client_provider = AssemblyAIClientProvider()
-transcription_service = TranscriptionService(
-    client_provider=client_provider,
-    assembly_client_provider=assembly_client_provider,
-)
-summarization_service = SummarizationService(
-    client_provider=client_provider,
-)
-session_store = SessionStore(ttl_minutes=settings.session_ttl_minutes)
-youtube_service = YouTubeAudioService(
-    output_dir=settings.temp_dir or None,
-    fmt=settings.youtube_audio_format,
-)
+
+T = TypeVar("T")
+
+
+def _singleton(factory: Callable[[], T]) -> Callable[[], T]:
+    """Build the service on first call; the warm-up thread may race the first request."""
+    lock = threading.Lock()
+    instance: list[T] = []
+
+    @wraps(factory)
+    def get() -> T:
+        if not instance:
+            with lock:
+                if not instance:
+                    instance.append(factory())
+        return instance[0]
+
+    return get
+
+
+@_singleton
+def get_admission_controller() -> AdmissionController:
+    return AdmissionController(
+        limits={
+            "upload": settings.admission_upload_limit,
+            "download": settings.admission_download_limit,
+            "stt": settings.admission_stt_limit,
+            "summarization": settings.admission_summary_limit,
+        },
+        service_times={
+            "upload": settings.admission_upload_seconds,
+            "download": settings.admission_download_seconds,
+            "stt": settings.admission_stt_seconds,
+            "summarization": settings.admission_summary_seconds,
+        },
+        max_wait_seconds=settings.admission_max_wait_seconds,
+        max_queue=settings.admission_max_queue,
+        priority_limit=settings.admission_priority_limit,
+    )
+
+
+@_singleton
+def get_client_provider() -> OpenAIClientProvider:
+    return OpenAIClientProvider()
+
+
+@_singleton
+def get_temp_storage() -> TempStorageManager:
+    return TempStorageManager(
+        root=settings.temp_dir or None,
+        quota_mb=settings.temp_storage_quota_mb,
+        min_free_mb=settings.temp_storage_min_free_mb,
+        memory_dir=settings.temp_memory_dir or None,
+        memory_quota_mb=settings.temp_memory_quota_mb,
+        memory_max_file_mb=settings.temp_memory_max_file_mb,
+        orphan_max_age_minutes=settings.temp_orphan_max_age_minutes,
+        retry_after_seconds=settings.temp_storage_retry_after_seconds,
+    )
+
+
+@_singleton
+def get_provider_router() -> ProviderRouter:
+    return ProviderRouter()
+
+
+@_singleton
+def get_transcription_service() -> TranscriptionService:
+    return TranscriptionService(
+        client_provider=get_client_provider(),
+        assembly_client_provider=AssemblyAIClientProvider(),
+        router=get_provider_router(),
+    )
+
+
+@_singleton
+def get_upload_service() -> ResumableUploadService:
+    return ResumableUploadService(
+        temp_storage=get_temp_storage(),
+        transcription_service=get_transcription_service(),
+        admission=get_admission_controller(),
+    )
+
+
+@_singleton
+def get_summarization_service() -> SummarizationService:
+    return SummarizationService(client_provider=get_client_provider())
+
+
+@_singleton
+def get_session_store() -> SessionStore:
+    search_index = SearchIndex() if settings.search_enabled else None
+    if settings.session_store_path:
+        return SqliteSessionStore(
+            settings.session_store_path,
+            ttl_minutes=settings.session_ttl_minutes,
+            max_records=settings.session_max_records,
+            search_index=search_index,
+        )
+    return SessionStore(
+        ttl_minutes=settings.session_ttl_minutes,
+        max_records=settings.session_max_records,
+        search_index=search_index,
+    )
+
+
+@_singleton
+def get_youtube_service() -> YouTubeAudioService:
+    return YouTubeAudioService(
+        fmt=settings.youtube_audio_format,
+        rate_limit_bytes=settings.youtube_max_download_rate_kbps * 1024,
+    )
 
 
 @app.get("/health")
-async def health() -> dict[str, str]:
-    return {"status": "ok"}
+async def health():
+    providers = "ready" if _providers_ready.is_set() else "warming"
+    if _draining.is_set():
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "draining", "providers": providers},
+        )
+    return {"status": "ok", "providers": providers}
+
+
+@app.get("/stats")
+async def stats():
+    """Load and provider health of this worker process."""
+    admission = get_admission_controller()
+    return {
+        "admission": admission.snapshot(),
+        "expected_wait_seconds": {
+            route: round(admission.expected_wait(work), 1) for route, work in _ROUTE_WORK.items()
+        },
+        "providers": get_provider_router().snapshot(),
+    }
+
+
+# The form is parsed by ``parse_upload_form`` rather than FastAPI, so its schema is
+# declared here for the OpenAPI docs.
+_UPLOAD_AUDIO_FORM = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {
+                        "file": {"type": "string", "format": "binary"},
+                        "apiKey": {"type": "string"},
+                        "assemblyApiKey": {"type": "string"},
+                        "assemblyModel": {"type": "string"},
+                        "sttModel": {"type": "string"},
+                        "summaryModel": {"type": "string"},
+                        "summaryMaxTokens": {"type": "integer"},
+                        "provider": {"type": "string"},
+                    },
+                }
+            }
+        },
+    }
+}
 
 
 @app.post(
@@ -74,18 +452,22 @@ async def health() -> dict[str, str]:
         415: {"model": ErrorResponse},
         500: {"model": ErrorResponse},
     },
+    openapi_extra=_UPLOAD_AUDIO_FORM,
 )
-async def upload_audio(
-    request: Request,
-    file: UploadFile = File(...),
-    api_key: str | None = Form(default=None, alias="apiKey"),
-    assembly_api_key: str | None = Form(default=None, alias="assemblyApiKey"),
-    assembly_model: str | None = Form(default=None, alias="assemblyModel"),
-    stt_model: str | None = Form(default=None, alias="sttModel"),
-    summary_model: str | None = Form(default=None, alias="summaryModel"),
-    summary_max_tokens: int | None = Form(default=None, alias="summaryMaxTokens"),
-    provider: str | None = Form(default=None, alias="provider"),
-) -> TranscriptionResponse:
+async def upload_audio(request: Request) -> Response:
+    lease: TempLease = request.state.temp_lease
+    admission = get_admission_controller()
+    try:
+        async with admission.stage("upload"):
+            form, audio_path = await parse_upload_form(
+                request, lease, settings.max_upload_size_mb * 1024 * 1024
+            )
+    except MultiPartException as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    file = form.get("file")
+    if not isinstance(file, UploadFile) or audio_path is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File missing.")
+    await file.close()
     if not file.filename:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File name missing.")
 
@@ -95,21 +477,18 @@ async def upload_audio(
             detail="Only audio uploads are supported.",
         )
 
-    options = build_request_options(
-        request,
-        TranscriptionOptions(
-            api_key=api_key,
-            assembly_api_key=assembly_api_key,
-            assembly_model=assembly_model,
-            stt_model=stt_model,
-            summary_model=summary_model,
-            summary_max_tokens=summary_max_tokens,
-            provider=provider,
-        ),
-    )
+    try:
+        # Empty form fields mean "not set", as they do for FastAPI's Form parameters.
+        payload = TranscriptionOptions.parse_obj(
+            {key: value for key, value in form.items() if isinstance(value, str) and value}
+        )
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors()) from exc
+    options = build_request_options(request, payload)
 
     try:
-        transcript = await transcription_service.transcribe_upload(file, options)
+        async with admission.stage("stt"):
+            transcript = await get_transcription_service().transcribe_path(audio_path, options)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     except TranscriptionError as exc:
@@ -122,20 +501,165 @@ async def upload_audio(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
         ) from exc
+    finally:
+        await asyncio.to_thread(lease.release)
 
     try:
-        summary = await summarization_service.summarize(transcript, options)
+        async with admission.stage("summarization"):
+            summary = await get_summarization_service().summarize(transcript.text, options)
     except Exception as exc:
         logger.exception("Summarization failure")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Summarization failed: {exc}",
         ) from exc
-    session_id = session_store.create(transcript, summary)
-    return TranscriptionResponse(
-        session_id=session_id,
-        transcript=transcript,
-        summary=summary,
+    session_id = await asyncio.to_thread(
+        get_session_store().create, transcript.text, summary, transcript
+    )
+    return trusted_response(
+        TranscriptionResponse(session_id=session_id, transcript=transcript.text, summary=summary)
+    )
+
+
+@app.post(
+    "/uploads",
+    response_model=ResumableUploadStatus,
+    status_code=status.HTTP_201_CREATED,
+    responses={400: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+)
+async def create_upload(
+    request: Request, response: Response, payload: ResumableUploadCreateRequest
+) -> ResumableUploadStatus:
+    options = build_request_options(request, payload)
+    try:
+        upload = await get_upload_service().create(
+            payload.filename, payload.size, payload.sha256, payload.segmented, options
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except StorageQuotaExceeded as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
+    response.headers["Location"] = f"/uploads/{upload.upload_id}"
+    response.headers["Upload-Offset"] = str(upload.offset)
+    return to_upload_status(upload)
+
+
+@app.put(
+    "/uploads/{upload_id}",
+    response_model=ResumableUploadStatus,
+    responses={
+        400: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+        409: {"model": ErrorResponse},
+        413: {"model": ErrorResponse},
+    },
+)
+async def upload_chunk(upload_id: str, request: Request, response: Response) -> ResumableUploadStatus:
+    return await store_chunk(upload_id, request, response)
+
+
+@app.put(
+    "/uploads/{upload_id}/segments/{index}",
+    response_model=ResumableUploadStatus,
+    responses={
+        400: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+        409: {"model": ErrorResponse},
+        413: {"model": ErrorResponse},
+    },
+)
+async def upload_segment_chunk(
+    upload_id: str, index: int, request: Request, response: Response
+) -> ResumableUploadStatus:
+    return await store_chunk(upload_id, request, response, segment=index)
+
+
+@app.get(
+    "/uploads/{upload_id}",
+    response_model=ResumableUploadStatus,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_upload(upload_id: str, response: Response) -> ResumableUploadStatus:
+    upload = await get_upload_status(upload_id)
+    response.headers["Upload-Offset"] = str(upload.offset)
+    return to_upload_status(upload)
+
+
+@app.head("/uploads/{upload_id}")
+async def head_upload(upload_id: str) -> Response:
+    upload = await get_upload_status(upload_id)
+    headers = {"Upload-Offset": str(upload.offset), "Cache-Control": "no-store"}
+    if upload.size is not None:
+        headers["Upload-Length"] = str(upload.size)
+    return Response(status_code=status.HTTP_200_OK, headers=headers)
+
+
+@app.delete("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_upload(upload_id: str) -> Response:
+    try:
+        await get_upload_service().discard(upload_id)
+    except UploadNotFound as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except UploadConflict as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@app.post(
+    "/uploads/{upload_id}/finalize",
+    response_model=TranscriptionResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+        409: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+)
+async def finalize_upload(
+    upload_id: str,
+    request: Request,
+    payload: ResumableUploadFinalizeRequest | None = None,
+) -> Response:
+    payload = payload or ResumableUploadFinalizeRequest()
+    options = build_request_options(request, payload)
+    finalize = get_upload_service().finalize(upload_id, options, payload.segment_count)
+    try:
+        # The upload is only discarded once the session is stored; if summarization
+        # fails the client can finalize again.
+        async with finalize as transcript:
+            try:
+                async with get_admission_controller().stage("summarization"):
+                    summary = await get_summarization_service().summarize(transcript.text, options)
+            except Exception as exc:
+                logger.exception("Summarization failure")
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Summarization failed: {exc}",
+                ) from exc
+            session_id = await asyncio.to_thread(
+                get_session_store().create, transcript.text, summary, transcript
+            )
+    except UploadNotFound as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except UploadConflict as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(exc),
+            headers={"Upload-Offset": str(exc.offset)},
+        ) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except TranscriptionError as exc:
+        logger.exception("Transcription failure")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
+        ) from exc
+    return trusted_response(
+        TranscriptionResponse(session_id=session_id, transcript=transcript.text, summary=summary)
     )
 
 
@@ -150,20 +674,15 @@ async def upload_audio(
 )
 async def youtube_transcribe(
     request: Request, payload: YouTubeTranscriptionRequest
-) -> TranscriptionResponse:
-    audio_path: Path | None = None
-    options = RequestOptions(
-        api_key=payload.api_key or request.headers.get("X-API-Key"),
-        assembly_api_key=payload.assembly_api_key or request.headers.get("X-AssemblyAI-Key"),
-        assembly_model=payload.assembly_model,
-        stt_model=payload.stt_model,
-        summary_model=payload.summary_model,
-        summary_max_tokens=payload.summary_max_tokens,
-        provider=payload.provider,
-    )
+) -> Response:
+    options = build_youtube_request_options(request, payload)
+    lease: TempLease = request.state.temp_lease
+    admission = get_admission_controller()
     try:
-        audio_path = await youtube_service.download_audio(str(payload.url))
-        transcript = await transcription_service.transcribe_path(audio_path, options)
+        async with admission.stage("download"):
+            audio_path = await get_youtube_service().download_audio(str(payload.url), lease)
+        async with admission.stage("stt"):
+            transcript = await get_transcription_service().transcribe_path(audio_path, options)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     except FileNotFoundError as exc:
@@ -174,40 +693,215 @@ async def youtube_transcribe(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
         ) from exc
     finally:
-        if audio_path:
-            await youtube_service.cleanup_path(audio_path)
+        await asyncio.to_thread(lease.release)
 
     try:
-        summary = await summarization_service.summarize(transcript, options)
+        async with admission.stage("summarization"):
+            summary = await get_summarization_service().summarize(transcript.text, options)
     except Exception as exc:
         logger.exception("Summarization failure")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Summarization failed: {exc}",
         ) from exc
-    session_id = session_store.create(transcript, summary)
-    return TranscriptionResponse(
-        session_id=session_id,
-        transcript=transcript,
-        summary=summary,
+    session_id = await asyncio.to_thread(
+        get_session_store().create, transcript.text, summary, transcript
     )
+    return trusted_response(
+        TranscriptionResponse(session_id=session_id, transcript=transcript.text, summary=summary)
+    )
+
+
+@app.post(
+    "/youtube-playlist-transcribe",
+    response_model=PlaylistTranscriptionResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+)
+async def youtube_playlist_transcribe(
+    request: Request, payload: YouTubePlaylistTranscriptionRequest
+) -> Response:
+    options = build_youtube_request_options(request, payload)
+    max_items = min(
+        payload.max_items or settings.youtube_playlist_max_items,
+        settings.youtube_playlist_max_items,
+    )
+    try:
+        entries = await get_youtube_service().list_playlist_entries(str(payload.url), max_items)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except Exception as exc:
+        logger.exception("Playlist expansion failed")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
+        ) from exc
+
+    concurrency = max(1, min(settings.youtube_playlist_concurrency, len(entries)))
+    # The request was admitted as one item; account for every item it runs at once.
+    try:
+        get_admission_controller().extend(concurrency - 1)
+    except AdmissionRejected as exc:
+        logger.warning("Shedding playlist of %d items: %s", len(entries), exc)
+        return JSONResponse(
+            status_code=exc.status_code,
+            content={"detail": str(exc)},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+    semaphore = asyncio.Semaphore(concurrency)
+    items = await asyncio.gather(
+        *(_transcribe_playlist_entry(entry, options, semaphore) for entry in entries)
+    )
+
+    combined_session_id: str | None = None
+    combined_summary: str | None = None
+    completed = [item for item in items if item.session_id]
+    if payload.combined_summary and completed:
+        sections = [
+            f"## {item.title or item.video_id}\n\n{item.summary or ''}".strip()
+            for item in completed
+        ]
+        try:
+            async with get_admission_controller().stage("summarization"):
+                combined_summary = await get_summarization_service().summarize(
+                    "\n\n".join(sections), options
+                )
+        except Exception:
+            logger.exception("Combined playlist summarization failure")
+        else:
+            combined_transcript = "\n\n".join(
+                f"## {item.title or item.video_id}\n\n{item.transcript}" for item in completed
+            )
+            combined_session_id = await asyncio.to_thread(
+                get_session_store().create, combined_transcript, combined_summary
+            )
+
+    return trusted_response(
+        PlaylistTranscriptionResponse(
+            items=list(items),
+            combined_session_id=combined_session_id,
+            combined_summary=combined_summary,
+        )
+    )
+
+
+async def _transcribe_playlist_entry(
+    entry: PlaylistEntry,
+    options: RequestOptions,
+    semaphore: asyncio.Semaphore,
+) -> PlaylistItemResult:
+    result = PlaylistItemResult(video_id=entry.video_id, url=entry.url, title=entry.title)
+    admission = get_admission_controller()
+    async with semaphore:
+        lease: TempLease | None = None
+        try:
+            lease = await asyncio.to_thread(
+                get_temp_storage().acquire,
+                f"playlist-{entry.video_id}",
+                settings.youtube_download_estimate_mb * 1024 * 1024,
+            )
+            async with admission.stage("download"):
+                audio_path = await get_youtube_service().download_audio(entry.url, lease)
+            async with admission.stage("stt"):
+                transcript = await get_transcription_service().transcribe_path(audio_path, options)
+            async with admission.stage("summarization"):
+                summary = await get_summarization_service().summarize(transcript.text, options)
+        except Exception as exc:
+            logger.warning("Playlist entry %s failed: %s", entry.video_id, exc)
+            result.error = str(exc)
+            return result
+        finally:
+            if lease:
+                await asyncio.to_thread(lease.release)
+
+    result.session_id = await asyncio.to_thread(
+        get_session_store().create, transcript.text, summary, transcript
+    )
+    result.transcript = transcript.text
+    result.summary = summary
+    return result
 
 
 @app.get(
     "/download-transcript",
     responses={404: {"model": ErrorResponse}},
 )
-async def download_transcript(session_id: str = Query(..., description="Session identifier.")):
-    record = session_store.get(session_id)
+async def download_transcript(
+    session_id: str = Query(..., description="Session identifier."),
+    export_format: Literal["txt", "srt", "vtt", "json"] = Query(
+        default="txt", alias="format", description="Export format."
+    ),
+):
+    record = await asyncio.to_thread(get_session_store().get_record, session_id)
     if not record:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found or expired.")
 
-    transcript, summary = record
-    content = f"Session: {session_id}\n\nSummary:\n{summary or 'No summary available.'}\n\nTranscript:\n{transcript or 'No transcript available.'}\n"
-    stream = io.BytesIO(content.encode("utf-8"))
+    segments = record.segments or SegmentedTranscript.from_text(record.transcript)
+    if export_format in {"srt", "vtt"} and not segments.has_timestamps:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Timestamps are not available for this session.",
+        )
+
+    if export_format == "srt":
+        stream, media_type = segments.iter_srt(), "application/x-subrip; charset=utf-8"
+    elif export_format == "vtt":
+        stream, media_type = segments.iter_vtt(), "text/vtt; charset=utf-8"
+    elif export_format == "json":
+        stream = segments.iter_json(session_id, record.summary)
+        media_type = "application/json"
+    else:
+        stream = iter(
+            (
+                f"Session: {session_id}\n\nSummary:\n{record.summary or 'No summary available.'}"
+                "\n\nTranscript:\n",
+                record.transcript or "No transcript available.",
+                "\n",
+            )
+        )
+        media_type = "text/plain; charset=utf-8"
+
+    filename = f"transcript-{session_id}.{export_format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    return StreamingResponse(stream, media_type=media_type, headers=headers)
+
 
-    headers = {"Content-Disposition": f'attachment; filename="transcript-{session_id}.txt"'}
-    return StreamingResponse(stream, media_type="text/plain; charset=utf-8", headers=headers)
+_SEARCH_MAX_SESSIONS = 200
+
+
+@app.get("/search", response_model=SearchResponse, responses={400: {"model": ErrorResponse}})
+async def search_sessions(
+    q: str = Query(..., min_length=1, max_length=500, description='Terms and "quoted phrases".'),
+    session_ids: list[str] = Query(
+        ...,
+        alias="session_id",
+        description="Sessions to search, repeated once per id; usually the caller's own.",
+    ),
+    limit: int = Query(default=10, ge=1, le=100),
+) -> Response:
+    # Session ids are the only credential for /download-transcript, so search never
+    # reveals sessions the caller did not name.
+    if len(session_ids) > _SEARCH_MAX_SESSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {_SEARCH_MAX_SESSIONS} session ids can be searched at once.",
+        )
+    results = await asyncio.to_thread(get_session_store().search, q, limit, session_ids)
+    return trusted_response(
+        SearchResponse(
+            query=q,
+            results=[
+                SearchHit(
+                    session_id=result.session_id,
+                    score=round(result.score, 4),
+                    snippet=result.snippet,
+                    created_at=result.created_at,
+                )
+                for result in results
+            ],
+        )
+    )
 
 
 def build_request_options(request: Request, payload: TranscriptionOptions) -> RequestOptions:
@@ -222,3 +916,104 @@ def build_request_options(request: Request, payload: TranscriptionOptions) -> Re
         summary_max_tokens=payload.summary_max_tokens,
         provider=payload.provider,
     )
+
+
+async def store_chunk(
+    upload_id: str, request: Request, response: Response, segment: int | None = None
+) -> ResumableUploadStatus:
+    service = get_upload_service()
+    try:
+        content_range = parse_content_range(request.headers.get("content-range"))
+        segment_start = request.headers.get("x-segment-start")
+        body = await read_body(request, service.max_chunk_bytes)
+        async with get_admission_controller().stage("upload"):
+            upload = await service.write_chunk(
+                upload_id,
+                content_range,
+                body,
+                checksum=request.headers.get("x-chunk-sha256"),
+                segment=segment,
+                segment_start=float(segment_start) if segment_start else None,
+            )
+    except UploadNotFound as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except UploadConflict as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(exc),
+            headers={"Upload-Offset": str(exc.offset)},
+        ) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    response.headers["Upload-Offset"] = str(upload.offset)
+    return to_upload_status(upload)
+
+
+async def read_body(request: Request, limit: int) -> bytes:
+    """Read a request body, failing with 413 as soon as it exceeds ``limit`` bytes."""
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Chunks may not exceed {limit} bytes.",
+    )
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > limit:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise too_large
+    return bytes(body)
+
+
+async def get_upload_status(upload_id: str) -> UploadStatus:
+    try:
+        return await get_upload_service().status(upload_id)
+    except UploadNotFound as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+
+
+def to_upload_status(upload: UploadStatus) -> ResumableUploadStatus:
+    return ResumableUploadStatus(
+        upload_id=upload.upload_id,
+        filename=upload.filename,
+        size=upload.size,
+        offset=upload.offset,
+        complete=upload.complete,
+        segmented=upload.segmented,
+        segments=[
+            UploadSegmentStatus(
+                index=segment.index,
+                offset=segment.offset,
+                size=segment.size,
+                complete=segment.complete,
+                transcribed=segment.transcribed,
+            )
+            for segment in upload.segments
+        ],
+        expires_at=datetime.fromtimestamp(upload.expires_at, timezone.utc),
+    )
+
+
+def expected_temp_bytes(request: Request) -> int:
+    """Projected temp usage of a request: its declared body size, or a per-route estimate."""
+    if request.url.path == "/upload-audio":
+        length = request.headers.get("content-length")
+        if length and length.isdigit():
+            return int(length)
+        return settings.max_upload_size_mb * 1024 * 1024
+    return settings.youtube_download_estimate_mb * 1024 * 1024
+
+
+def build_youtube_request_options(
+    request: Request, payload: YouTubeTranscriptionRequest
+) -> RequestOptions:
+    return RequestOptions(
+        api_key=payload.api_key or request.headers.get("X-API-Key"),
+        assembly_api_key=payload.assembly_api_key or request.headers.get("X-AssemblyAI-Key"),
+        assembly_model=payload.assembly_model,
+        stt_model=payload.stt_model,
+        summary_model=payload.summary_model,
+        summary_max_tokens=payload.summary_max_tokens,
+        provider=payload.provider,
+    )
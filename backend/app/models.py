@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 
 from pydantic import BaseModel, Field, HttpUrl
 
@@ -25,6 +26,27 @@ class YouTubeTranscriptionRequest(BaseModel):
         populate_by_name = True
 
 
+class YouTubePlaylistTranscriptionRequest(YouTubeTranscriptionRequest):
+    max_items: Optional[int] = Field(default=None, ge=1, alias="maxItems")
+    combined_summary: bool = Field(default=True, alias="combinedSummary")
+
+
+class PlaylistItemResult(BaseModel):
+    video_id: str
+    url: str
+    title: Optional[str] = None
+    session_id: Optional[str] = None
+    transcript: Optional[str] = None
+    summary: Optional[str] = None
+    error: Optional[str] = None
+
+
+class PlaylistTranscriptionResponse(BaseModel):
+    items: List[PlaylistItemResult]
+    combined_session_id: Optional[str] = None
+    combined_summary: Optional[str] = None
+
+
 class TranscriptionOptions(BaseModel):
     api_key: Optional[str] = Field(default=None, alias="apiKey")
     assembly_api_key: Optional[str] = Field(default=None, alias="assemblyApiKey")
@@ -38,6 +60,36 @@ class TranscriptionOptions(BaseModel):
         populate_by_name = True
 
 
+class ResumableUploadCreateRequest(TranscriptionOptions):
+    filename: str
+    size: Optional[int] = Field(default=None, ge=1)
+    sha256: Optional[str] = None
+    segmented: bool = False
+
+
+class ResumableUploadFinalizeRequest(TranscriptionOptions):
+    segment_count: Optional[int] = Field(default=None, ge=1, alias="segmentCount")
+
+
+class UploadSegmentStatus(BaseModel):
+    index: int
+    offset: int
+    size: int
+    complete: bool
+    transcribed: bool
+
+
+class ResumableUploadStatus(BaseModel):
+    upload_id: str
+    filename: str
+    size: Optional[int] = None
+    offset: int
+    complete: bool
+    segmented: bool
+    segments: List[UploadSegmentStatus] = []
+    expires_at: datetime
+
+
 class TranscriptionRequest(BaseModel):
     api_key: Optional[str] = Field(None, alias="apiKey")
     assembly_api_key: Optional[str] = Field(None, alias="assemblyApiKey")
@@ -48,5 +100,17 @@ class TranscriptionRequest(BaseModel):
     provider: Optional[str] = Field(None, alias="provider")  # "openai" or "assemblyai"
 
 
+class SearchHit(BaseModel):
+    session_id: str
+    score: float
+    snippet: str
+    created_at: datetime
+
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchHit]
+
+
 class ErrorResponse(BaseModel):
     detail: str
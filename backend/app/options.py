@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
-
-import assemblyai as aai
+from typing import TYPE_CHECKING, Optional
 
 from .config import settings
 
+if TYPE_CHECKING:  # pragma: no cover - imported lazily to keep startup fast
+    import assemblyai as aai
+
 
 @dataclass
 class RequestOptions:
@@ -36,7 +37,9 @@ class RequestOptions:
             )
         return key
 
-    def resolved_assembly_model(self) -> aai.SpeechModel:
+    def resolved_assembly_model(self) -> "aai.SpeechModel":
+        import assemblyai as aai
+
         model = (self.assembly_model or settings.assembly_model or "universal").lower()
         mapping = {
             "universal": aai.SpeechModel.universal,
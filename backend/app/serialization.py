@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:  # pragma: no cover - optional speed-up
+    import orjson
+except ImportError:  # pragma: no cover - fall back to the stdlib encoder
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, BaseModel):
+        return value.dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode ``content`` as compact UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(
+        content, ensure_ascii=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (or compact stdlib JSON as a fallback)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def trusted_response(model: BaseModel, status_code: int = 200) -> FastJSONResponse:
+    """Serialize a model built by the server itself, skipping FastAPI's response pass.
+
+    Returning a ``Response`` makes FastAPI skip re-validating the value against
+    ``response_model`` and running ``jsonable_encoder`` over it, which for long
+    transcripts means two extra deep copies before encoding. Only use this for
+    models whose fields the route constructed; ``response_model`` still documents
+    the schema.
+    """
+    return FastJSONResponse(model.dict(), status_code=status_code)
@@ -1,17 +1,51 @@
 """Service layer exports."""
 
-from .session_store import SessionStore
+from .admission import AdmissionController, AdmissionRejected, AdmissionTicket
+from .provider_router import ProviderRouter
+from .resumable_uploads import (
+    ContentRange,
+    ResumableUploadService,
+    UploadConflict,
+    UploadNotFound,
+    UploadStatus,
+    parse_content_range,
+)
+from .search_index import SearchIndex
+from .segments import Segment, SegmentedTranscript
+from .session_store import SearchResult, SessionRecord, SessionStore
+from .sqlite_session_store import SqliteSessionStore
 from .summarization import SummarizationService
+from .temp_storage import StorageQuotaExceeded, TempLease, TempStorageManager
 from .transcription import TranscriptionError, TranscriptionService
 from .openai_client import AssemblyAIClientProvider, OpenAIClientProvider
-from .youtube import YouTubeAudioService
+from .youtube import PlaylistEntry, YouTubeAudioService
 
 __all__ = [
     "SummarizationService",
     "TranscriptionService",
     "TranscriptionError",
     "SessionStore",
+    "SqliteSessionStore",
     "OpenAIClientProvider",
     "AssemblyAIClientProvider",
     "YouTubeAudioService",
+    "PlaylistEntry",
+    "TempStorageManager",
+    "TempLease",
+    "StorageQuotaExceeded",
+    "AdmissionController",
+    "AdmissionRejected",
+    "AdmissionTicket",
+    "Segment",
+    "SegmentedTranscript",
+    "SessionRecord",
+    "SearchIndex",
+    "SearchResult",
+    "ProviderRouter",
+    "ResumableUploadService",
+    "UploadStatus",
+    "UploadConflict",
+    "UploadNotFound",
+    "ContentRange",
+    "parse_content_range",
 ]
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Iterable, Mapping, Optional, Tuple
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of being queued."""
+
+    def __init__(self, message: str, status_code: int, retry_after: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+@dataclass
+class WorkClass:
+    """Concurrency limit and live load for one kind of work (upload, STT, ...)."""
+
+    name: str
+    limit: int
+    estimated_seconds: float
+    admitted: int = 0
+    waiting: int = 0
+    in_flight: int = 0
+    semaphore: asyncio.Semaphore = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.limit = max(self.limit, 1)
+        self.semaphore = asyncio.Semaphore(self.limit)
+
+    @property
+    def depth(self) -> int:
+        # ``admitted`` only counts requests that have not reached this stage yet; once
+        # they do, they are counted by ``waiting`` and ``in_flight`` instead.
+        return self.admitted + self.waiting + self.in_flight
+
+    def expected_wait(self, extra: int = 1) -> float:
+        queued = max(self.depth + extra - self.limit, 0)
+        return math.ceil(queued / self.limit) * self.estimated_seconds
+
+
+@dataclass
+class AdmissionTicket:
+    """Load accounted to an admitted request; released when the response is sent.
+
+    ``pending`` counts the runs of each work class the request has not started yet
+    (one, or one per parallel item for playlists). A run is handed over to the
+    class's live counts when it enters that stage, so an upload in progress no
+    longer counts as queued STT work once it gets there.
+    """
+
+    controller: "AdmissionController"
+    work: Tuple[str, ...]
+    priority: bool = False
+    released: bool = False
+    pending: Dict[str, int] = field(default_factory=dict)
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self.controller._release(self)
+
+    def start(self, name: str) -> None:
+        if not self.released and self.pending.get(name, 0) > 0:
+            self.pending[name] -= 1
+            self.controller._classes[name].admitted -= 1
+
+
+# The ticket of the request being handled. Tasks copy the context they are created
+# in, so stages run by the route (or by tasks it spawns) can find their ticket.
+_current_ticket: ContextVar[Optional[AdmissionTicket]] = ContextVar(
+    "admission_ticket", default=None
+)
+
+
+class AdmissionController:
+    """Sheds load early instead of letting requests queue until they time out.
+
+    Each route declares the work classes it goes through. A request is admitted
+    only if the expected wait across those classes, derived from live queue depth
+    and a moving average of observed service times, stays under ``max_wait_seconds``.
+    Cheap routes use a separate priority lane so they never queue behind heavy work.
+    """
+
+    def __init__(
+        self,
+        limits: Mapping[str, int],
+        service_times: Mapping[str, float],
+        max_wait_seconds: float = 120.0,
+        max_queue: int = 32,
+        priority_limit: int = 32,
+        smoothing: float = 0.2,
+    ) -> None:
+        self._classes: Dict[str, WorkClass] = {
+            name: WorkClass(name=name, limit=limit, estimated_seconds=service_times.get(name, 1.0))
+            for name, limit in limits.items()
+        }
+        self._max_wait = max_wait_seconds
+        self._max_queue = max(max_queue, 0)
+        self._priority_limit = max(priority_limit, 1)
+        self._priority_in_flight = 0
+        self._smoothing = smoothing
+
+    def admit(self, work: Iterable[str]) -> AdmissionTicket:
+        names = tuple(work)
+        self._check(names, 1)
+        for name in names:
+            self._classes[name].admitted += 1
+        ticket = AdmissionTicket(controller=self, work=names, pending=dict.fromkeys(names, 1))
+        _current_ticket.set(ticket)
+        return ticket
+
+    def extend(self, units: int) -> None:
+        """Account ``units`` more parallel runs of the current request's work.
+
+        Used by requests that fan out, such as playlists. Raises ``AdmissionRejected``
+        like ``admit`` when the extra load does not fit.
+        """
+        ticket = _current_ticket.get()
+        if ticket is None or ticket.released or units <= 0:
+            return
+        self._check(ticket.work, units)
+        for name in ticket.work:
+            self._classes[name].admitted += units
+            ticket.pending[name] = ticket.pending.get(name, 0) + units
+
+    def admit_priority(self) -> AdmissionTicket:
+        if self._priority_in_flight >= self._priority_limit:
+            raise AdmissionRejected(
+                "Too many concurrent requests; please retry shortly.",
+                status_code=503,
+                retry_after=1,
+            )
+        self._priority_in_flight += 1
+        return AdmissionTicket(controller=self, work=(), priority=True)
+
+    @asynccontextmanager
+    async def stage(self, name: str) -> AsyncIterator[None]:
+        """Run one unit of ``name`` work under its concurrency limit and time it."""
+        work_class = self._classes[name]
+        work_class.waiting += 1
+        ticket = _current_ticket.get()
+        if ticket is not None:
+            ticket.start(name)
+        try:
+            await work_class.semaphore.acquire()
+        finally:
+            work_class.waiting -= 1
+        work_class.in_flight += 1
+        started = time.monotonic()
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        finally:
+            work_class.in_flight -= 1
+            work_class.semaphore.release()
+            if succeeded:
+                self._observe(work_class, time.monotonic() - started)
+
+    def expected_wait(self, work: Iterable[str]) -> float:
+        return sum(self._classes[name].expected_wait() for name in work)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {
+                "limit": work_class.limit,
+                "in_flight": work_class.in_flight,
+                "waiting": work_class.waiting,
+                "admitted": work_class.admitted,
+                "estimated_seconds": round(work_class.estimated_seconds, 2),
+            }
+            for name, work_class in self._classes.items()
+        }
+
+    def _check(self, names: Tuple[str, ...], units: int) -> None:
+        classes = [self._classes[name] for name in names]
+        for work_class in classes:
+            if work_class.depth + units - work_class.limit > self._max_queue:
+                raise AdmissionRejected(
+                    f"Too many queued {work_class.name} requests; please retry later.",
+                    status_code=429,
+                    retry_after=self._retry_after(work_class.expected_wait(units)),
+                )
+        wait = sum(work_class.expected_wait(units) for work_class in classes)
+        if wait > self._max_wait:
+            raise AdmissionRejected(
+                f"Service is overloaded (expected wait {wait:.0f}s); please retry later.",
+                status_code=503,
+                retry_after=self._retry_after(wait),
+            )
+
+    def _observe(self, work_class: WorkClass, elapsed: float) -> None:
+        work_class.estimated_seconds += self._smoothing * (elapsed - work_class.estimated_seconds)
+
+    def _release(self, ticket: AdmissionTicket) -> None:
+        if ticket.priority:
+            self._priority_in_flight -= 1
+            return
+        for name, units in ticket.pending.items():
+            self._classes[name].admitted -= units
+        ticket.pending.clear()
+
+    @staticmethod
+    def _retry_after(wait: float) -> int:
+        return max(int(math.ceil(wait)), 1)
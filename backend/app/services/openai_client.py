@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from typing import Optional
-
-from openai import OpenAI
-import assemblyai as aai
+from typing import TYPE_CHECKING, Optional
 
 from ..config import settings
 
+if TYPE_CHECKING:  # pragma: no cover - imported lazily to keep startup fast
+    import assemblyai as aai
+    from openai import OpenAI
+
 
 class OpenAIClientProvider:
     """Creates OpenAI API clients with per-request overrides."""
@@ -21,11 +22,13 @@ class OpenAIClientProvider:
         self._api_base = api_base
         self._timeout = timeout
 
-    def create_client(self, api_key: Optional[str] = None) -> OpenAI:
+    def create_client(self, api_key: Optional[str] = None) -> "OpenAI":
         key = api_key or self._default_api_key
         if not key:
             raise ValueError("OpenAI API key is required.")
 
+        from openai import OpenAI
+
         kwargs: dict[str, object] = {"api_key": key, "timeout": self._timeout}
         if self._api_base:
             kwargs["base_url"] = self._api_base
@@ -42,10 +45,12 @@ class AssemblyAIClientProvider:
     ) -> None:
         self._default_api_key = default_api_key
 
-    def create_client(self, api_key: Optional[str] = None) -> aai.Transcriber:
+    def create_client(self, api_key: Optional[str] = None) -> "aai.Transcriber":
         key = api_key or self._default_api_key
         if not key:
             raise ValueError("AssemblyAI API key is required.")
 
+        import assemblyai as aai
+
         aai.settings.api_key = key
         return aai.Transcriber()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Sequence
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Percentile-based hedge delays are only trusted once this many samples exist.
+_MIN_LATENCY_SAMPLES = 20
+_MIN_ERROR_SAMPLES = 10
+
+
+@dataclass
+class ProviderHealth:
+    """Rolling latency/error statistics and circuit breaker state for one provider.
+
+    Latencies are stored in seconds per MB of audio, since STT time grows with the
+    length of the recording.
+    """
+
+    name: str
+    window: int
+    latencies: Deque[float] = field(init=False)
+    outcomes: Deque[bool] = field(init=False)
+    consecutive_failures: int = 0
+    opened_at: Optional[float] = None
+    trial_in_flight: bool = False
+
+    def __post_init__(self) -> None:
+        self.latencies = deque(maxlen=self.window)
+        self.outcomes = deque(maxlen=self.window)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if len(self.latencies) < _MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(int(fraction * len(ordered)), len(ordered) - 1)
+        return ordered[index]
+
+
+class ProviderRouter:
+    """Orders STT providers and decides when to hedge, with a circuit breaker each.
+
+    A breaker opens after ``failure_threshold`` consecutive failures, or when at
+    least half of the recent calls failed. After ``cooldown_seconds`` it lets a
+    single trial request through (half-open); the trial's outcome closes or
+    re-opens it.
+    """
+
+    def __init__(
+        self,
+        failover: bool = settings.transcription_failover,
+        hedge: bool = settings.transcription_hedge,
+        hedge_percentile: float = settings.transcription_hedge_percentile,
+        hedge_min_delay: float = settings.transcription_hedge_min_delay_seconds,
+        hedge_default_delay: float = settings.transcription_hedge_default_delay_seconds,
+        failure_threshold: int = settings.circuit_breaker_failures,
+        cooldown_seconds: float = settings.circuit_breaker_cooldown_seconds,
+        window: int = 200,
+    ) -> None:
+        self.failover = failover
+        self.hedge = hedge
+        self._hedge_percentile = hedge_percentile
+        self._hedge_min_delay = hedge_min_delay
+        self._hedge_default_delay = hedge_default_delay
+        self._failure_threshold = max(failure_threshold, 1)
+        self._cooldown = cooldown_seconds
+        self._window = window
+        self._health: Dict[str, ProviderHealth] = {}
+        self._lock = threading.Lock()
+
+    def order(self, providers: Sequence[str]) -> List[str]:
+        """Return ``providers`` (preferred first) with open circuits moved to the back.
+
+        Providers whose circuit is open are still returned last, so a request is
+        attempted even when every breaker is open.
+        """
+        with self._lock:
+            ready = [name for name in providers if self._is_available_locked(name)]
+        return ready + [name for name in providers if name not in ready]
+
+    def acquire(self, provider: str) -> bool:
+        """Claim the half-open trial slot if ``provider``'s circuit needs one."""
+        with self._lock:
+            health = self._get_locked(provider)
+            if health.opened_at is None:
+                return False
+            health.trial_in_flight = True
+            return True
+
+    def hedge_delay(self, provider: str, size_mb: float) -> float:
+        with self._lock:
+            per_mb = self._get_locked(provider).percentile(self._hedge_percentile)
+        if per_mb is None:
+            return self._hedge_default_delay
+        return max(per_mb * max(size_mb, 0.1), self._hedge_min_delay)
+
+    def record_success(self, provider: str, elapsed: float, size_mb: float) -> None:
+        with self._lock:
+            health = self._get_locked(provider)
+            health.latencies.append(elapsed / max(size_mb, 0.1))
+            health.outcomes.append(True)
+            health.consecutive_failures = 0
+            health.trial_in_flight = False
+            if health.opened_at is not None:
+                logger.info("Circuit for %s closed", provider)
+                health.opened_at = None
+
+    def record_failure(self, provider: str) -> None:
+        with self._lock:
+            health = self._get_locked(provider)
+            health.outcomes.append(False)
+            health.consecutive_failures += 1
+            was_trial = health.trial_in_flight
+            health.trial_in_flight = False
+            tripped = health.consecutive_failures >= self._failure_threshold or (
+                len(health.outcomes) >= _MIN_ERROR_SAMPLES and health.error_rate >= 0.5
+            )
+            if was_trial or (tripped and health.opened_at is None):
+                logger.warning(
+                    "Circuit for %s opened (error rate %.0f%%)", provider, health.error_rate * 100
+                )
+                health.opened_at = time.monotonic()
+
+    def release(self, provider: str) -> None:
+        """Give back a half-open trial slot whose request was cancelled."""
+        with self._lock:
+            self._get_locked(provider).trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        with self._lock:
+            return {
+                name: {
+                    "circuit": "closed" if health.opened_at is None else "open",
+                    "error_rate": round(health.error_rate, 3),
+                    "p50_seconds_per_mb": health.percentile(0.5),
+                    "p95_seconds_per_mb": health.percentile(0.95),
+                    "samples": len(health.outcomes),
+                }
+                for name, health in self._health.items()
+            }
+
+    def _is_available_locked(self, provider: str) -> bool:
+        health = self._get_locked(provider)
+        if health.opened_at is None:
+            return True
+        if health.trial_in_flight:
+            return False
+        return time.monotonic() - health.opened_at >= self._cooldown
+
+    def _get_locked(self, provider: str) -> ProviderHealth:
+        health = self._health.get(provider)
+        if health is None:
+            health = self._health[provider] = ProviderHealth(name=provider, window=self._window)
+        return health
@@ -0,0 +1,663 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import threading
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set
+
+from ..config import settings
+from ..options import RequestOptions
+from .admission import AdmissionController
+from .segments import SegmentedTranscript
+from .temp_storage import LEASE_PREFIX, TempLease, TempStorageManager
+from .transcription import TranscriptionService
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: uploads are only safe within one process
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_CONTENT_RANGE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+_SHA256 = re.compile(r"^[0-9a-fA-F]{64}$")
+_META = "meta.json"
+# Held with flock while meta.json is read and changed, so workers never overwrite
+# each other's segment declarations.
+_LOCK = "meta.lock"
+# Created with O_EXCL by the worker that finalizes the upload.
+_FINALIZING = "finalizing"
+_LOCAL_LOCK = threading.Lock()
+# Options stored in meta.json, so that any worker transcribes an upload's segments
+# the way the client asked. API keys are never written to disk.
+_STORED_OPTIONS = ("provider", "stt_model", "assembly_model", "summary_model", "summary_max_tokens")
+
+
+class UploadNotFound(Exception):
+    """Raised for unknown, expired or already finalized uploads."""
+
+
+class UploadConflict(Exception):
+    """Raised when a chunk or finalize call does not match the stored upload state."""
+
+    def __init__(self, message: str, offset: int) -> None:
+        super().__init__(message)
+        self.offset = offset
+
+
+@dataclass(frozen=True)
+class ContentRange:
+    start: int
+    end: int  # inclusive, as in the header
+    total: int
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
+
+
+def parse_content_range(value: Optional[str]) -> ContentRange:
+    """Parse ``Content-Range: bytes <start>-<end>/<total>``."""
+    match = _CONTENT_RANGE.match((value or "").strip())
+    if not match:
+        raise ValueError("Content-Range header must look like 'bytes <start>-<end>/<total>'.")
+    start, end, total = (int(group) for group in match.groups())
+    if start > end or end >= total:
+        raise ValueError("Content-Range is out of bounds.")
+    return ContentRange(start=start, end=end, total=total)
+
+
+@dataclass
+class SegmentStatus:
+    index: int
+    offset: int
+    size: int
+    transcribed: bool
+
+    @property
+    def complete(self) -> bool:
+        return self.offset >= self.size
+
+
+@dataclass
+class UploadStatus:
+    upload_id: str
+    filename: str
+    size: Optional[int]
+    offset: int
+    segmented: bool
+    segments: List[SegmentStatus]
+    expires_at: float
+
+    @property
+    def complete(self) -> bool:
+        if self.segmented:
+            return bool(self.segments) and all(segment.complete for segment in self.segments)
+        return self.size is not None and self.offset >= self.size
+
+
+@dataclass
+class _Upload:
+    upload_id: str
+    # Last copy read from meta.json; changes always re-read it under the file lock.
+    meta: Dict[str, Any]
+    lease: TempLease
+    options: Optional[RequestOptions] = None
+    tasks: Dict[int, "asyncio.Task[SegmentedTranscript]"] = field(default_factory=dict)
+
+    @property
+    def directory(self) -> Path:
+        return self.lease.directory
+
+
+class ResumableUploadService:
+    """Resumable, chunked uploads stored as named leases in the managed temp area.
+
+    Clients create an upload, ``PUT`` byte ranges until the offset reaches the
+    declared size (re-sending after a dropped connection from the offset reported
+    by ``status``), then finalize it. State lives on disk (``meta.json`` plus the
+    data files, whose sizes are the offsets), so any worker can continue an upload.
+    Every change takes the upload's file lock and re-reads ``meta.json``; only
+    the lease and early transcription tasks are kept per process.
+
+    Segmented uploads carry independently decodable audio pieces (e.g. 5 minute
+    recorder chunks). Each piece is transcribed as soon as its last byte arrives,
+    so at finalize time only the tail is left to transcribe.
+    """
+
+    def __init__(
+        self,
+        temp_storage: TempStorageManager,
+        transcription_service: TranscriptionService,
+        admission: Optional[AdmissionController] = None,
+        max_upload_size_mb: int = settings.max_upload_size_mb,
+        max_chunk_mb: int = settings.upload_max_chunk_mb,
+        ttl_minutes: int = settings.upload_session_ttl_minutes,
+    ) -> None:
+        self._temp_storage = temp_storage
+        self._transcription = transcription_service
+        self._admission = admission
+        self._max_upload_bytes = max_upload_size_mb * 1024 * 1024
+        self._max_chunk_bytes = max(max_chunk_mb, 1) * 1024 * 1024
+        self._ttl = ttl_minutes * 60
+        self._uploads: Dict[str, _Upload] = {}
+        self._finalizing: Set[str] = set()
+
+    @property
+    def max_chunk_bytes(self) -> int:
+        return self._max_chunk_bytes
+
+    async def create(
+        self,
+        filename: str,
+        size: Optional[int],
+        sha256: Optional[str] = None,
+        segmented: bool = False,
+        options: Optional[RequestOptions] = None,
+    ) -> UploadStatus:
+        if not segmented and not size:
+            raise ValueError("The total upload size is required for non-segmented uploads.")
+        if size and size > self._max_upload_bytes:
+            raise ValueError(
+                f"File exceeds maximum size of {self._max_upload_bytes / (1024 * 1024):.0f} MB"
+            )
+        if sha256 and not _SHA256.match(sha256):
+            raise ValueError("sha256 must be a hex-encoded SHA-256 digest.")
+
+        options = options or RequestOptions()
+        upload_id = uuid.uuid4().hex
+        meta: Dict[str, Any] = {
+            "upload_id": upload_id,
+            "filename": filename,
+            "suffix": Path(filename).suffix or ".mp3",
+            "size": size,
+            "sha256": sha256.lower() if sha256 else None,
+            "segmented": segmented,
+            "created_at": time.time(),
+            "segments": {},
+            "options": {name: getattr(options, name) for name in _STORED_OPTIONS},
+            # Workers that adopt the upload cannot use the client's keys, so they
+            # leave its segments to finalize instead of transcribing them early.
+            "client_keys": bool(options.api_key or options.assembly_api_key),
+        }
+        lease = await asyncio.to_thread(
+            self._temp_storage.acquire_named,
+            _lease_name(upload_id),
+            f"resumable-{upload_id}",
+            size or self._max_upload_bytes,
+        )
+        await asyncio.to_thread(_init_upload, lease.directory, meta)
+        upload = _Upload(upload_id=upload_id, meta=meta, lease=lease, options=options)
+        self._uploads[upload_id] = upload
+        return await asyncio.to_thread(self._status, upload)
+
+    async def status(self, upload_id: str) -> UploadStatus:
+        upload = await self._get(upload_id)
+        return await asyncio.to_thread(self._status, upload)
+
+    async def write_chunk(
+        self,
+        upload_id: str,
+        content_range: ContentRange,
+        body: bytes,
+        checksum: Optional[str] = None,
+        segment: Optional[int] = None,
+        segment_start: Optional[float] = None,
+    ) -> UploadStatus:
+        """Store one byte range; ranges must start at or before the current offset.
+
+        Ranges that overlap data already received are accepted and only their new
+        tail is written, so clients can safely retry a chunk whose response was lost.
+        """
+        if len(body) != content_range.length:
+            raise ValueError(
+                f"Body has {len(body)} bytes but Content-Range declares {content_range.length}."
+            )
+        if len(body) > self._max_chunk_bytes:
+            raise ValueError(f"Chunks may not exceed {self._max_chunk_bytes} bytes.")
+        if checksum is not None and hashlib.sha256(body).hexdigest() != checksum.lower():
+            raise ValueError("Chunk checksum does not match X-Chunk-SHA256.")
+
+        upload = await self._get(upload_id)
+        offset = await asyncio.to_thread(
+            self._store_chunk, upload, content_range, body, segment, segment_start
+        )
+        if segment is not None and offset >= content_range.total:
+            self._start_segment(upload, segment)
+        return await asyncio.to_thread(self._status, upload)
+
+    @asynccontextmanager
+    async def finalize(
+        self,
+        upload_id: str,
+        options: RequestOptions,
+        segment_count: Optional[int] = None,
+    ) -> AsyncIterator[SegmentedTranscript]:
+        """Verify the upload and transcribe what is left; yields the transcript.
+
+        Options the finalize request leaves unset fall back to those given at creation.
+        The upload is claimed on disk for the whole block, so no other worker can
+        finalize it or add chunks meanwhile. It is discarded once the block succeeds;
+        on failure the claim is dropped and the upload kept, so finalize can be retried.
+        """
+        upload = await self._get(upload_id)
+        await asyncio.to_thread(self._claim, upload)
+        self._finalizing.add(upload_id)
+        try:
+            stored = upload.meta.get("options") or {}
+            options = replace(
+                options,
+                **{name: value for name, value in stored.items() if getattr(options, name) is None},
+            )
+            if upload.meta["segmented"]:
+                transcript = await self._finalize_segments(upload, options, segment_count)
+            else:
+                path = self._data_path(upload)
+                await asyncio.to_thread(self._verify_complete, upload, path)
+                transcript = await self._transcribe(path, options)
+            yield transcript
+        except BaseException:
+            self._finalizing.discard(upload_id)
+            await asyncio.to_thread(_unclaim, upload.directory)
+            raise
+        self._finalizing.discard(upload_id)
+        await self._discard(upload, force=True)
+
+    async def discard(self, upload_id: str) -> None:
+        """Delete an upload; raises ``UploadConflict`` while it is being finalized."""
+        await self._discard(await self._get(upload_id), force=False)
+
+    async def drain(self, timeout: float) -> None:
+        """Wait for early segment transcriptions so their results reach the disk.
+
+        Used on shutdown: another worker can then finalize the upload without
+        transcribing those segments again.
+        """
+        pending = [
+            task for upload in self._uploads.values() for task in upload.tasks.values() if not task.done()
+        ]
+        if pending:
+            logger.info("Waiting for %d segment transcriptions before shutdown", len(pending))
+            await asyncio.wait(pending, timeout=timeout)
+
+    async def expire(self) -> int:
+        """Drop uploads that have not received data for the configured TTL."""
+        cutoff = time.time() - self._ttl
+        expired = 0
+        for upload_id, upload in list(self._uploads.items()):
+            if upload_id in self._finalizing:
+                continue
+            # A claim left by a worker that died while finalizing is as old as its
+            # last activity, so such uploads expire like any other.
+            last_activity = await asyncio.to_thread(_last_activity, upload.directory)
+            if last_activity > cutoff:
+                continue
+            logger.info("Expiring resumable upload %s", upload_id)
+            try:
+                await self._discard(upload, force=True)
+            except UploadNotFound:
+                continue
+            expired += 1
+        return expired
+
+    async def _get(self, upload_id: str) -> _Upload:
+        """Return the upload with a fresh copy of its meta.json.
+
+        Raises ``UploadNotFound`` once the upload is gone, including when another
+        worker finalized or discarded it.
+        """
+        upload = self._uploads.get(upload_id)
+        if upload is None and not re.fullmatch(r"[0-9a-f]{32}", upload_id):
+            raise UploadNotFound("Upload not found or expired.")
+        directory = self._temp_storage.root / f"{LEASE_PREFIX}{_lease_name(upload_id)}"
+        try:
+            meta = await asyncio.to_thread(_load_meta, directory)
+        except UploadNotFound:
+            if upload is not None:
+                await self._forget(upload)
+            raise
+        if upload is not None:
+            upload.meta = meta
+            return upload
+
+        # Another worker may have created the upload; pick up its on-disk state.
+        lease = await asyncio.to_thread(
+            self._temp_storage.adopt,
+            _lease_name(upload_id),
+            f"resumable-{upload_id}",
+            meta["size"] or self._max_upload_bytes,
+        )
+        if lease is None:
+            raise UploadNotFound("Upload not found or expired.")
+        options = None
+        if not meta.get("client_keys"):
+            options = RequestOptions(**(meta.get("options") or {}))
+        return self._uploads.setdefault(
+            upload_id, _Upload(upload_id=upload_id, meta=meta, lease=lease, options=options)
+        )
+
+    def _status(self, upload: _Upload) -> UploadStatus:
+        meta = upload.meta
+        segments: List[SegmentStatus] = []
+        if meta["segmented"]:
+            for key, info in sorted(meta["segments"].items(), key=lambda item: int(item[0])):
+                index = int(key)
+                segments.append(
+                    SegmentStatus(
+                        index=index,
+                        offset=_file_size(self._segment_path(upload, index)),
+                        size=info["size"],
+                        transcribed=self._has_result(upload, index),
+                    )
+                )
+            offset = sum(segment.offset for segment in segments)
+        else:
+            offset = _file_size(self._data_path(upload))
+        return UploadStatus(
+            upload_id=upload.upload_id,
+            filename=meta["filename"],
+            size=meta["size"],
+            offset=offset,
+            segmented=meta["segmented"],
+            segments=segments,
+            expires_at=_last_activity(upload.directory) + self._ttl,
+        )
+
+    def _store_chunk(
+        self,
+        upload: _Upload,
+        content_range: ContentRange,
+        body: bytes,
+        segment: Optional[int],
+        segment_start: Optional[float],
+    ) -> int:
+        with _locked(upload.directory) as meta:
+            upload.meta = meta
+            if (upload.directory / _FINALIZING).exists():
+                raise UploadConflict("Upload is being finalized.", 0)
+            if segment is None:
+                if meta["segmented"]:
+                    raise ValueError("Segmented uploads take chunks at /segments/{index}.")
+                if content_range.total != meta["size"]:
+                    raise ValueError("Content-Range total does not match the upload size.")
+                path = self._data_path(upload)
+            else:
+                if not meta["segmented"]:
+                    raise ValueError("This upload was not created as a segmented upload.")
+                self._declare_segment(upload, segment, content_range.total, segment_start)
+                path = self._segment_path(upload, segment)
+            return _write_range(path, content_range, body)
+
+    def _claim(self, upload: _Upload) -> None:
+        with _locked(upload.directory) as meta:
+            upload.meta = meta
+            flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
+            try:
+                os.close(os.open(upload.directory / _FINALIZING, flags))
+            except FileExistsError:
+                raise UploadConflict("Upload is already being finalized.", 0) from None
+
+    async def _discard(self, upload: _Upload, force: bool) -> None:
+        try:
+            await asyncio.to_thread(_remove_meta, upload.directory, force)
+        except UploadNotFound:
+            await self._forget(upload)
+            raise
+        await self._forget(upload)
+
+    async def _forget(self, upload: _Upload) -> None:
+        """Drop this worker's state for an upload and delete whatever is left of it."""
+        self._uploads.pop(upload.upload_id, None)
+        for task in upload.tasks.values():
+            task.cancel()
+        await asyncio.to_thread(upload.lease.release)
+
+    def _declare_segment(
+        self, upload: _Upload, index: int, size: int, start: Optional[float]
+    ) -> None:
+        """Record a segment in ``upload.meta``; the caller holds the file lock."""
+        if index < 0:
+            raise ValueError("Segment index must not be negative.")
+        segments: Dict[str, Dict[str, Any]] = upload.meta["segments"]
+        info = segments.get(str(index))
+        if info is not None:
+            if info["size"] != size:
+                raise ValueError("Content-Range total does not match the segment size.")
+            return
+        declared = sum(item["size"] for item in segments.values()) + size
+        limit = min(upload.meta["size"] or self._max_upload_bytes, self._max_upload_bytes)
+        if declared > limit:
+            raise ValueError(f"Segments exceed the upload size limit of {limit} bytes.")
+        segments[str(index)] = {"size": size, "start": start}
+        _write_meta(upload.directory, upload.meta)
+
+    def _start_segment(self, upload: _Upload, index: int) -> None:
+        # Without the client's options (an upload adopted from another worker that
+        # was created with the client's own keys), finalize transcribes the segment.
+        if index in upload.tasks or upload.options is None:
+            return
+        task = asyncio.create_task(self._transcribe_segment(upload, index, upload.options))
+        task.add_done_callback(_log_task_failure)
+        upload.tasks[index] = task
+
+    async def _transcribe_segment(
+        self, upload: _Upload, index: int, options: RequestOptions
+    ) -> SegmentedTranscript:
+        transcript = await self._transcribe(self._segment_path(upload, index), options)
+        # Persist the result so a finalize call handled by another worker can reuse it.
+        await asyncio.to_thread(_write_transcript, self._result_path(upload, index), transcript)
+        return transcript
+
+    async def _finalize_segments(
+        self, upload: _Upload, options: RequestOptions, segment_count: Optional[int]
+    ) -> SegmentedTranscript:
+        status = await asyncio.to_thread(self._status, upload)
+        received = {segment.index: segment for segment in status.segments}
+        count = segment_count or (max(received) + 1 if received else 0)
+        extra = sorted(index for index in received if index >= count)
+        if extra:
+            raise ValueError(f"Segments {extra} are beyond segment_count {count}.")
+        missing = [
+            index for index in range(count) if index not in received or not received[index].complete
+        ]
+        if not count or missing:
+            raise UploadConflict(
+                f"Segments not fully uploaded: {missing or [0]}.", status.offset
+            )
+        expected = upload.meta["sha256"]
+        if expected:
+            paths = [self._segment_path(upload, index) for index in range(count)]
+            if await asyncio.to_thread(_files_sha256, paths) != expected:
+                raise ValueError("Uploaded segments do not match the declared sha256.")
+
+        async def result(index: int) -> SegmentedTranscript:
+            task = upload.tasks.get(index)
+            if task is not None:
+                try:
+                    return await asyncio.shield(task)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.warning("Early transcription of segment %d failed; retrying", index)
+            cached = await asyncio.to_thread(_read_transcript, self._result_path(upload, index))
+            if cached is not None:
+                return cached
+            return await self._transcribe_segment(upload, index, options)
+
+        parts = await asyncio.gather(*(result(index) for index in range(count)))
+        starts = [upload.meta["segments"][str(index)]["start"] for index in range(count)]
+        return SegmentedTranscript.concat(list(zip(parts, starts)))
+
+    async def _transcribe(self, path: Path, options: RequestOptions) -> SegmentedTranscript:
+        if self._admission is None:
+            return await self._transcription.transcribe_path(path, options)
+        async with self._admission.stage("stt"):
+            return await self._transcription.transcribe_path(path, options)
+
+    def _verify_complete(self, upload: _Upload, path: Path) -> None:
+        offset = _file_size(path)
+        if offset < upload.meta["size"]:
+            raise UploadConflict(
+                f"Upload incomplete: {offset} of {upload.meta['size']} bytes received.", offset
+            )
+        expected = upload.meta["sha256"]
+        if expected and _files_sha256([path]) != expected:
+            raise ValueError("Uploaded file does not match the declared sha256.")
+
+    def _data_path(self, upload: _Upload) -> Path:
+        return upload.directory / f"data{upload.meta['suffix']}"
+
+    def _segment_path(self, upload: _Upload, index: int) -> Path:
+        return upload.directory / f"segment-{index:05d}{upload.meta['suffix']}"
+
+    def _result_path(self, upload: _Upload, index: int) -> Path:
+        return upload.directory / f"segment-{index:05d}.transcript.json"
+
+    def _has_result(self, upload: _Upload, index: int) -> bool:
+        task = upload.tasks.get(index)
+        if task is not None and task.done() and not task.cancelled() and not task.exception():
+            return True
+        return self._result_path(upload, index).exists()
+
+
+def _lease_name(upload_id: str) -> str:
+    return f"resumable-{upload_id}"
+
+
+def _write_range(path: Path, content_range: ContentRange, body: bytes) -> int:
+    offset = _file_size(path)
+    if content_range.start > offset:
+        raise UploadConflict(
+            f"Chunk starts at byte {content_range.start} but only {offset} bytes were received.",
+            offset,
+        )
+    skip = offset - content_range.start
+    if skip < len(body):
+        with path.open("ab") as handle:
+            handle.write(body[skip:])
+    return max(offset, content_range.end + 1)
+
+
+def _init_upload(directory: Path, meta: Dict[str, Any]) -> None:
+    (directory / _LOCK).touch()
+    _write_meta(directory, meta)
+
+
+@contextmanager
+def _locked(directory: Path) -> Iterator[Dict[str, Any]]:
+    """Hold the upload's cross-process lock and yield its current meta.json.
+
+    Raises ``UploadNotFound`` once the upload has been removed.
+    """
+    try:
+        fd = os.open(directory / _LOCK, os.O_RDWR)
+    except FileNotFoundError:
+        raise UploadNotFound("Upload not found or expired.") from None
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            _LOCAL_LOCK.acquire()
+        try:
+            meta = _read_meta(directory)
+            if meta is None:
+                raise UploadNotFound("Upload not found or expired.")
+            yield meta
+        finally:
+            if fcntl is None:
+                _LOCAL_LOCK.release()
+    finally:
+        # Closing the descriptor drops the flock.
+        os.close(fd)
+
+
+def _load_meta(directory: Path) -> Dict[str, Any]:
+    with _locked(directory) as meta:
+        return meta
+
+
+def _unclaim(directory: Path) -> None:
+    (directory / _FINALIZING).unlink(missing_ok=True)
+
+
+def _remove_meta(directory: Path, force: bool) -> None:
+    """Make the upload unknown to every worker before its files are deleted."""
+    with _locked(directory):
+        if not force and (directory / _FINALIZING).exists():
+            raise UploadConflict("Upload is being finalized.", 0)
+        (directory / _META).unlink()
+
+
+def _write_meta(directory: Path, meta: Dict[str, Any]) -> None:
+    tmp_path = directory / f"{_META}.tmp"
+    tmp_path.write_text(json.dumps(meta), encoding="utf-8")
+    os.replace(tmp_path, directory / _META)
+
+
+def _read_meta(directory: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads((directory / _META).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_transcript(path: Path, transcript: SegmentedTranscript) -> None:
+    payload = {
+        "timed": transcript.has_timestamps,
+        "text": transcript.text,
+        "segments": [
+            (segment.start, segment.end, segment.text, segment.speaker) for segment in transcript
+        ],
+    }
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _read_transcript(path: Path) -> Optional[SegmentedTranscript]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not payload["timed"]:
+        return SegmentedTranscript.from_text(payload["text"])
+    return SegmentedTranscript.from_segments(tuple(item) for item in payload["segments"])
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _files_sha256(paths: List[Path]) -> str:
+    """SHA-256 of the files' contents, one after the other."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with path.open("rb") as handle:
+            for block in iter(lambda: handle.read(1024 * 1024), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _last_activity(directory: Path) -> float:
+    try:
+        return max(entry.stat().st_mtime for entry in directory.iterdir())
+    except (OSError, ValueError):
+        return 0.0
+
+
+def _log_task_failure(task: "asyncio.Task[Any]") -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Early segment transcription failed: %s", task.exception())
+
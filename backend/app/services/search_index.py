@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import chain, compress, islice, repeat
+from operator import itemgetter, sub
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+_TOKEN = re.compile(r"\w+")
+_PHRASE = re.compile(r'"([^"]+)"')
+
+# Okapi BM25 parameters.
+_K1 = 1.2
+_B = 0.75
+
+# Removals only tombstone the document; posting lists are rewritten in a background
+# thread once this many (and at least a quarter of the live documents) have piled up.
+_COMPACT_MIN_DELETED = 1000
+# Posting entries (documents across terms) rewritten per lock acquisition during
+# compaction; keeps each hold to a few milliseconds.
+_COMPACT_BATCH = 20000
+
+SNIPPET_CHARS = 160
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+@dataclass
+class SearchMatch:
+    session_id: str
+    score: float
+
+
+@dataclass
+class ParsedQuery:
+    terms: List[str]
+    phrases: List[List[str]]
+
+    @property
+    def all_terms(self) -> List[str]:
+        seen: Dict[str, None] = dict.fromkeys(self.terms)
+        for phrase in self.phrases:
+            seen.update(dict.fromkeys(phrase))
+        return list(seen)
+
+
+def parse_query(query: str) -> ParsedQuery:
+    """Split a query into loose terms and ``"quoted phrases"``."""
+    phrases = [tokenize(match) for match in _PHRASE.findall(query)]
+    loose = tokenize(_PHRASE.sub(" ", query))
+    single_word_phrases = [phrase[0] for phrase in phrases if len(phrase) == 1]
+    return ParsedQuery(
+        terms=loose + single_word_phrases,
+        phrases=[phrase for phrase in phrases if len(phrase) > 1],
+    )
+
+
+class _Postings:
+    """Posting list for one term.
+
+    ``docs`` and ``offsets`` are parallel ``array('I')`` columns and all positions
+    share one more ``array('I')``; a document's term frequency is the distance to the
+    next offset. A term therefore costs two machine words per document plus one per
+    occurrence. Doc ids only grow, so new documents are plain appends.
+    """
+
+    __slots__ = ("docs", "offsets", "positions")
+
+    def __init__(self) -> None:
+        self.docs = array("I")
+        self.offsets = array("I")
+        self.positions = array("I")
+
+    def append(self, doc: int, positions: Sequence[int]) -> None:
+        self.docs.append(doc)
+        self.offsets.append(len(self.positions))
+        self.positions.extend(positions)
+
+    def frequencies(self, docs: Set[int]) -> Iterator[Tuple[int, int]]:
+        """Yield ``(doc, tf)`` for ``docs``, all of which must be in this list."""
+        if len(docs) * 16 < len(self.docs):
+            for doc in docs:
+                start, end = self._span(bisect_left(self.docs, doc))
+                yield doc, end - start
+            return
+        ends = chain(islice(self.offsets, 1, None), (len(self.positions),))
+        for doc, start, end in zip(self.docs, self.offsets, ends):
+            if doc in docs:
+                yield doc, end - start
+
+    def contains(self, doc: int) -> bool:
+        index = bisect_left(self.docs, doc)
+        return index < len(self.docs) and self.docs[index] == doc
+
+    def doc_positions(self, doc: int) -> array:
+        index = bisect_left(self.docs, doc)
+        if index >= len(self.docs) or self.docs[index] != doc:
+            return array("I")
+        start, end = self._span(index)
+        return self.positions[start:end]
+
+    def without(self, deleted: Set[int]) -> "_Postings":
+        """Return the list without ``deleted`` documents (``self`` if none are in it)."""
+        docs = self.docs
+        dropped = list(compress(range(len(docs)), map(deleted.__contains__, docs)))
+        if not dropped:
+            return self
+        kept = _Postings()
+        run = 0
+        # Copy each run of kept entries between dropped ones as whole slices.
+        for index in chain(dropped, (len(docs),)):
+            if index > run:
+                first = self.offsets[run]
+                last = self._span(index - 1)[1]
+                shift = first - len(kept.positions)
+                kept.docs.extend(docs[run:index])
+                kept.offsets.extend(map(sub, self.offsets[run:index], repeat(shift)))
+                kept.positions.extend(self.positions[first:last])
+            run = index + 1
+        return kept
+
+    def _span(self, index: int) -> Tuple[int, int]:
+        end = self.offsets[index + 1] if index + 1 < len(self.offsets) else len(self.positions)
+        return self.offsets[index], end
+
+
+class SearchIndex:
+    """Incremental inverted index over session transcripts and summaries.
+
+    Queries match documents containing every term and every quoted phrase, ranked
+    with BM25. Thread-safe, but ``add`` tokenizes the whole text, so callers on an
+    event loop should run it in a worker thread.
+    """
+
+    def __init__(self) -> None:
+        self._terms: Dict[str, _Postings] = {}
+        self._doc_ids: Dict[str, int] = {}
+        self._sessions: Dict[int, str] = {}
+        self._lengths: Dict[int, int] = {}
+        self._deleted: Set[int] = set()
+        self._total_length = 0
+        self._next_doc = 0
+        self._compacting = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def add(self, session_id: str, text: str) -> None:
+        by_term: Dict[str, List[int]] = {}
+        tokens = tokenize(text)
+        for position, term in enumerate(tokens):
+            by_term.setdefault(term, []).append(position)
+
+        with self._lock:
+            self._remove_locked(session_id)
+            doc = self._next_doc
+            self._next_doc += 1
+            for term, positions in by_term.items():
+                postings = self._terms.get(term)
+                if postings is None:
+                    postings = self._terms[term] = _Postings()
+                postings.append(doc, positions)
+            self._doc_ids[session_id] = doc
+            self._sessions[doc] = session_id
+            self._lengths[doc] = len(tokens)
+            self._total_length += len(tokens)
+
+    def remove(self, session_ids: Iterable[str]) -> None:
+        """Tombstone sessions; compaction starts in a background thread when due."""
+        with self._lock:
+            for session_id in session_ids:
+                self._remove_locked(session_id)
+            due = len(self._deleted) >= max(_COMPACT_MIN_DELETED, len(self._sessions) // 4)
+            start = due and not self._compacting
+            if start:
+                self._compacting = True
+        if start:
+            threading.Thread(
+                target=self._compact_in_background, name="search-index-compact", daemon=True
+            ).start()
+
+    def compact(self) -> None:
+        """Drop tombstoned documents from the posting lists.
+
+        Terms are rewritten a batch at a time, each batch under the lock, so searches
+        and indexing keep running during a large compaction. Documents removed while
+        it runs stay tombstoned until the next one.
+        """
+        with self._lock:
+            deleted = set(self._deleted)
+            terms = list(self._terms)
+        if not deleted:
+            return
+        while terms:
+            with self._lock:
+                budget = _COMPACT_BATCH
+                while terms and budget > 0:
+                    term = terms.pop()
+                    postings = self._terms.get(term)
+                    if postings is None:
+                        continue
+                    budget -= len(postings.docs)
+                    kept = postings.without(deleted)
+                    if kept.docs:
+                        self._terms[term] = kept
+                    else:
+                        del self._terms[term]
+        with self._lock:
+            self._deleted -= deleted
+
+    def search(
+        self,
+        query: str | ParsedQuery,
+        limit: int = 10,
+        within: Optional[Iterable[str]] = None,
+    ) -> List[SearchMatch]:
+        """Rank matching sessions, optionally only among the ``within`` session ids."""
+        parsed = parse_query(query) if isinstance(query, str) else query
+        terms = parsed.all_terms
+        if not terms or limit <= 0:
+            return []
+
+        with self._lock:
+            postings = [self._terms.get(term) for term in terms]
+            if any(item is None for item in postings):
+                return []
+            by_term = dict(zip(terms, postings))
+            ordered = sorted(by_term.values(), key=lambda item: len(item.docs))
+            if within is not None:
+                # Removed sessions have no doc id, so tombstones need no check here.
+                scope = (self._doc_ids.get(key) for key in within)
+                candidates = {
+                    doc
+                    for doc in scope
+                    if doc is not None and all(item.contains(doc) for item in ordered)
+                }
+            else:
+                candidates = set(ordered[0].docs)
+                candidates -= self._deleted
+                for item in ordered[1:]:
+                    if not candidates:
+                        return []
+                    candidates.intersection_update(item.docs)
+            if not candidates:
+                return []
+
+            live = len(self._sessions)
+            average = self._total_length / live if live else 1.0
+            lengths = self._lengths
+            norms = {doc: _K1 * (1 - _B + _B * lengths[doc] / average) for doc in candidates}
+            scores = dict.fromkeys(candidates, 0.0)
+            for term, item in by_term.items():
+                weight = _idf(self._doc_freq_locked(item), live) * (_K1 + 1)
+                for doc, tf in item.frequencies(candidates):
+                    scores[doc] += weight * tf / (tf + norms[doc])
+
+            if not parsed.phrases:
+                top = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+            else:
+                # Phrase checks need positions, so only verify documents in score
+                # order until enough of them match.
+                phrases = [[by_term[term] for term in phrase] for phrase in parsed.phrases]
+                top = []
+                for doc, score in sorted(scores.items(), key=itemgetter(1), reverse=True):
+                    if all(_contains_phrase(doc, phrase) for phrase in phrases):
+                        top.append((doc, score))
+                        if len(top) >= limit:
+                            break
+            return [SearchMatch(session_id=self._sessions[doc], score=score) for doc, score in top]
+
+    def _remove_locked(self, session_id: str) -> None:
+        doc = self._doc_ids.pop(session_id, None)
+        if doc is None:
+            return
+        del self._sessions[doc]
+        self._total_length -= self._lengths.pop(doc)
+        self._deleted.add(doc)
+
+    def _doc_freq_locked(self, postings: _Postings) -> int:
+        """Live documents in ``postings``; tombstones stay in them until compaction."""
+        deleted = self._deleted
+        if not deleted:
+            return len(postings.docs)
+        if len(deleted) * 16 < len(postings.docs):
+            dead = sum(map(postings.contains, deleted))
+        else:
+            dead = sum(map(deleted.__contains__, postings.docs))
+        return len(postings.docs) - dead
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        finally:
+            with self._lock:
+                self._compacting = False
+
+
+def build_snippet(text: str, query: ParsedQuery, width: int = SNIPPET_CHARS) -> str:
+    """Return a window of ``text`` around the first match of a phrase or term."""
+    patterns = [r"\W+".join(re.escape(word) for word in phrase) for phrase in query.phrases]
+    patterns += [re.escape(term) for term in query.terms]
+    if not text or not patterns:
+        return ""
+    match = re.search(rf"\b(?:{'|'.join(patterns)})\b", text, flags=re.IGNORECASE)
+    if not match:
+        return text[:width].strip()
+
+    center = (match.start() + match.end()) // 2
+    start = max(center - width // 2, 0)
+    end = min(start + width, len(text))
+    start = max(end - width, 0)
+    if start > 0:
+        space = text.find(" ", start, match.start())
+        start = space + 1 if space != -1 else start
+    if end < len(text):
+        space = text.rfind(" ", match.end(), end)
+        end = space if space != -1 else end
+    snippet = " ".join(text[start:end].split())
+    return f"{'…' if start > 0 else ''}{snippet}{'…' if end < len(text) else ''}"
+
+
+def _idf(doc_freq: int, live: int) -> float:
+    return math.log(1 + (live - doc_freq + 0.5) / (doc_freq + 0.5))
+
+
+def _contains_phrase(doc: int, postings: Sequence[_Postings]) -> bool:
+    starts = set(postings[0].doc_positions(doc))
+    for shift, item in enumerate(postings[1:], start=1):
+        starts.intersection_update(map(sub, item.doc_positions(doc), repeat(shift)))
+        if not starts:
+            return False
+    return True
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import json
+import re
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Exports are generated lazily from the arrays; cues are grouped into chunks of
+# roughly this many characters so streaming does not write one tiny chunk per cue.
+EXPORT_CHUNK_CHARS = 16 * 1024
+
+# Word-level input (AssemblyAI without speaker labels) is grouped into cues no
+# longer than these limits, which keeps subtitles readable.
+CUE_MAX_SECONDS = 6.0
+CUE_MAX_CHARS = 84
+_SENTENCE_END = (".", "?", "!")
+# A blank line ends a subtitle cue, so cue text must not contain one.
+_BLANK_LINES = re.compile(r"\s*\n\s*\n\s*")
+
+
+@dataclass(frozen=True)
+class Segment:
+    start: Optional[float]
+    end: Optional[float]
+    text: str
+    speaker: Optional[str] = None
+
+
+class SegmentedTranscript:
+    """Transcript text plus segment timing stored in compact parallel arrays.
+
+    All segment texts live in one ``text`` buffer separated by single spaces. Each
+    segment costs five machine integers (character span, start/end in ms, speaker
+    index) instead of a Python object, so memory stays close to the raw text size.
+    A transcript without timing information is a single untimed segment.
+    """
+
+    __slots__ = ("text", "_spans", "_times", "_speakers", "_speaker_labels", "_timed")
+
+    def __init__(
+        self,
+        text: str,
+        spans: array,
+        times: array,
+        speakers: array,
+        speaker_labels: Sequence[str],
+        timed: bool,
+    ) -> None:
+        self.text = text
+        self._spans = spans
+        self._times = times
+        self._speakers = speakers
+        self._speaker_labels = tuple(speaker_labels)
+        self._timed = timed
+
+    @classmethod
+    def from_text(cls, text: str) -> "SegmentedTranscript":
+        text = (text or "").strip()
+        spans = array("I", (0, len(text)) if text else ())
+        times = array("I", (0, 0) if text else ())
+        speakers = array("H", (0,) if text else ())
+        return cls(text, spans, times, speakers, ("",), timed=False)
+
+    @classmethod
+    def from_segments(
+        cls, segments: Iterable[Tuple[float, float, str, Optional[str]]]
+    ) -> "SegmentedTranscript":
+        """Build from ``(start_seconds, end_seconds, text, speaker)`` tuples."""
+        parts: List[str] = []
+        spans = array("I")
+        times = array("I")
+        speakers = array("H")
+        labels: List[str] = [""]
+        label_index = {"": 0}
+        cursor = 0
+
+        for start, end, segment_text, speaker in segments:
+            segment_text = (segment_text or "").strip()
+            if not segment_text:
+                continue
+            if parts:
+                cursor += 1
+            parts.append(segment_text)
+            spans.append(cursor)
+            cursor += len(segment_text)
+            spans.append(cursor)
+            start_ms = max(int(round((start or 0.0) * 1000)), 0)
+            times.append(start_ms)
+            times.append(max(int(round((end or 0.0) * 1000)), start_ms))
+            label = speaker or ""
+            if label not in label_index:
+                label_index[label] = len(labels)
+                labels.append(label)
+            speakers.append(label_index[label])
+
+        if not parts:
+            return cls.from_text("")
+        return cls(" ".join(parts), spans, times, speakers, labels, timed=True)
+
+    @classmethod
+    def concat(
+        cls, parts: Sequence[Tuple["SegmentedTranscript", Optional[float]]]
+    ) -> "SegmentedTranscript":
+        """Join transcripts of consecutive audio pieces, shifting their timestamps.
+
+        Each part comes with the start time of its audio in seconds; ``None`` means
+        "right after the previous part's last segment".
+        """
+        if not all(part.has_timestamps for part, _ in parts):
+            return cls.from_text(" ".join(part.text for part, _ in parts if part.text))
+
+        def shifted() -> Iterator[Tuple[float, float, str, Optional[str]]]:
+            cursor = 0.0
+            for part, start in parts:
+                base = cursor if start is None else start
+                for segment in part:
+                    yield (
+                        base + (segment.start or 0.0),
+                        base + (segment.end or 0.0),
+                        segment.text,
+                        segment.speaker,
+                    )
+                    cursor = max(cursor, base + (segment.end or 0.0))
+
+        return cls.from_segments(shifted())
+
+    def to_bytes(self) -> bytes:
+        """Pack the segment arrays (not the text) for storage next to ``text``."""
+        header = json.dumps({"timed": self._timed, "labels": self._speaker_labels}).encode()
+        return b"".join(
+            (
+                len(header).to_bytes(4, "little"),
+                len(self).to_bytes(4, "little"),
+                header,
+                self._spans.tobytes(),
+                self._times.tobytes(),
+                self._speakers.tobytes(),
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, text: str, data: bytes) -> "SegmentedTranscript":
+        header_size = int.from_bytes(data[:4], "little")
+        count = int.from_bytes(data[4:8], "little")
+        header = json.loads(data[8 : 8 + header_size])
+        arrays = (array("I"), array("I"), array("H"))
+        position = 8 + header_size
+        for column, items in zip(arrays, (2 * count, 2 * count, count)):
+            size = items * column.itemsize
+            column.frombytes(data[position : position + size])
+            position += size
+        spans, times, speakers = arrays
+        return cls(text, spans, times, speakers, header["labels"], timed=header["timed"])
+
+    @property
+    def has_timestamps(self) -> bool:
+        return self._timed
+
+    def __len__(self) -> int:
+        return len(self._speakers)
+
+    def __iter__(self) -> Iterator[Segment]:
+        for index in range(len(self)):
+            yield self.segment(index)
+
+    def segment(self, index: int) -> Segment:
+        text = self.text[self._spans[2 * index] : self._spans[2 * index + 1]]
+        speaker = self._speaker_labels[self._speakers[index]] or None
+        if not self._timed:
+            return Segment(start=None, end=None, text=text, speaker=speaker)
+        return Segment(
+            start=self._times[2 * index] / 1000,
+            end=self._times[2 * index + 1] / 1000,
+            text=text,
+            speaker=speaker,
+        )
+
+    def iter_srt(self) -> Iterator[str]:
+        return _chunked(self._srt_cues())
+
+    def iter_vtt(self) -> Iterator[str]:
+        return _chunked(self._vtt_cues())
+
+    def iter_json(self, session_id: str, summary: str) -> Iterator[str]:
+        return _chunked(self._json_parts(session_id, summary))
+
+    def _srt_cues(self) -> Iterator[str]:
+        for number, segment in enumerate(self, start=1):
+            text = f"{segment.speaker}: {segment.text}" if segment.speaker else segment.text
+            # SRT has no escaping; "-->" in the text would read as a timing line.
+            text = _cue_text(text).replace("-->", "->")
+            yield (
+                f"{number}\n{_timestamp(segment.start, ',')} --> "
+                f"{_timestamp(segment.end, ',')}\n{text}\n\n"
+            )
+
+    def _vtt_cues(self) -> Iterator[str]:
+        yield "WEBVTT\n\n"
+        for segment in self:
+            text = _vtt_escape(_cue_text(segment.text))
+            if segment.speaker:
+                text = f"<v {_vtt_escape(_cue_text(segment.speaker))}>{text}"
+            yield (
+                f"{_timestamp(segment.start, '.')} --> {_timestamp(segment.end, '.')}\n{text}\n\n"
+            )
+
+    def _json_parts(self, session_id: str, summary: str) -> Iterator[str]:
+        yield (
+            f'{{"session_id": {json.dumps(session_id, ensure_ascii=False)}, '
+            f'"summary": {json.dumps(summary, ensure_ascii=False)}, '
+            f'"has_timestamps": {json.dumps(self._timed)}, "segments": ['
+        )
+        for index, segment in enumerate(self):
+            item = {"start": segment.start, "end": segment.end, "text": segment.text}
+            if segment.speaker:
+                item["speaker"] = segment.speaker
+            yield ("" if index == 0 else ", ") + json.dumps(item, ensure_ascii=False)
+        yield "]}\n"
+
+
+def group_words(
+    words: Iterable[Tuple[float, float, str, Optional[str]]]
+) -> Iterator[Tuple[float, float, str, Optional[str]]]:
+    """Merge word timings into subtitle-sized cues, splitting on sentence ends and speakers."""
+    start: Optional[float] = None
+    end = 0.0
+    speaker: Optional[str] = None
+    buffer: List[str] = []
+    length = 0
+
+    for word_start, word_end, word, word_speaker in words:
+        if buffer and (
+            word_speaker != speaker
+            or word_end - (start or 0.0) > CUE_MAX_SECONDS
+            or length + len(word) + 1 > CUE_MAX_CHARS
+        ):
+            yield start or 0.0, end, " ".join(buffer), speaker
+            buffer, length, start = [], 0, None
+        if start is None:
+            start, speaker = word_start, word_speaker
+        buffer.append(word)
+        length += len(word) + 1
+        end = word_end
+        if word.endswith(_SENTENCE_END):
+            yield start, end, " ".join(buffer), speaker
+            buffer, length, start = [], 0, None
+
+    if buffer:
+        yield start or 0.0, end, " ".join(buffer), speaker
+
+
+def _timestamp(seconds: Optional[float], separator: str) -> str:
+    total_ms = int(round((seconds or 0.0) * 1000))
+    hours, rest = divmod(total_ms, 3_600_000)
+    minutes, rest = divmod(rest, 60_000)
+    secs, millis = divmod(rest, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def _cue_text(text: str) -> str:
+    return _BLANK_LINES.sub("\n", text.strip())
+
+
+def _vtt_escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _chunked(parts: Iterable[str]) -> Iterator[str]:
+    buffer: List[str] = []
+    size = 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= EXPORT_CHUNK_CHARS:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
@@ -4,7 +4,10 @@ import threading
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .search_index import SearchIndex, build_snippet, parse_query
+from .segments import SegmentedTranscript
 
 
 @dataclass
@@ -13,17 +16,41 @@ class SessionRecord:
     summary: str
     created_at: datetime
     expires_at: datetime
+    segments: Optional[SegmentedTranscript] = None
+
+
+@dataclass
+class SearchResult:
+    session_id: str
+    score: float
+    snippet: str
+    created_at: datetime
 
 
 class SessionStore:
-    """Simple in-memory session storage with expiration support."""
+    """Simple in-memory session storage with expiration support.
+
+    When given a ``SearchIndex``, transcripts and summaries are indexed as they are
+    stored and dropped from the index when sessions expire or are evicted. Indexing
+    happens inside ``create``, so async callers should run it in a worker thread.
+    """
 
-    def __init__(self, ttl_minutes: int = 120) -> None:
+    def __init__(
+        self,
+        ttl_minutes: int = 120,
+        max_records: int = 0,
+        search_index: Optional[SearchIndex] = None,
+    ) -> None:
         self._ttl = timedelta(minutes=ttl_minutes)
+        self._max_records = max(max_records, 0)
         self._records: Dict[str, SessionRecord] = {}
         self._lock = threading.Lock()
+        self._index = search_index
 
-    def create(self, transcript: str, summary: str) -> str:
+    def create(
+        self, transcript: str, summary: str, segments: Optional[SegmentedTranscript] = None
+    ) -> str:
+        """Store a session; ``transcript`` should be ``segments.text`` when segments are given."""
         session_id = uuid.uuid4().hex
         now = datetime.now(timezone.utc)
         record = SessionRecord(
@@ -31,25 +58,77 @@ class SessionStore:
             summary=summary,
             created_at=now,
             expires_at=now + self._ttl,
+            segments=segments,
         )
         with self._lock:
             self._records[session_id] = record
-            self._purge_locked()
+            removed = self._purge_locked()
+        if self._index is not None:
+            self._index.add(session_id, f"{transcript}\n{summary}")
+            if removed:
+                self._index.remove(removed)
         return session_id
 
     def get(self, session_id: str) -> Optional[Tuple[str, str]]:
+        record = self.get_record(session_id)
+        if not record:
+            return None
+        return record.transcript, record.summary
+
+    def get_record(self, session_id: str) -> Optional[SessionRecord]:
         with self._lock:
             record = self._records.get(session_id)
             if not record:
                 return None
             if record.expires_at <= datetime.now(timezone.utc):
                 del self._records[session_id]
-                return None
-            return record.transcript, record.summary
+                record = None
+        if record is None and self._index is not None:
+            self._index.remove([session_id])
+        return record
+
+    def search(
+        self, query: str, limit: int = 10, within: Optional[Iterable[str]] = None
+    ) -> List[SearchResult]:
+        """Rank stored sessions by ``query`` terms and ``"quoted phrases"``.
+
+        With ``within``, only those session ids are considered.
+        """
+        if self._index is None:
+            return []
+        parsed = parse_query(query)
+        results: List[SearchResult] = []
+        # Ask for a few extra matches in case some expired since they were indexed.
+        for match in self._index.search(parsed, limit + 5, within):
+            record = self.get_record(match.session_id)
+            if not record:
+                continue
+            results.append(
+                SearchResult(
+                    session_id=match.session_id,
+                    score=match.score,
+                    snippet=build_snippet(f"{record.transcript}\n{record.summary}", parsed),
+                    created_at=record.created_at,
+                )
+            )
+            if len(results) >= limit:
+                break
+        return results
+
+    def _purge_locked(self) -> List[str]:
+        """Remove expired and over-capacity sessions; caller must hold the lock.
 
-    def _purge_locked(self) -> None:
-        """Remove expired sessions; caller must hold the lock."""
+        Every record has the same TTL and dicts keep insertion order, so expired
+        records are always at the front and the scan stops at the first live one.
+        """
         now = datetime.now(timezone.utc)
-        expired = [key for key, record in self._records.items() if record.expires_at <= now]
-        for key in expired:
+        removed: List[str] = []
+        for key, record in self._records.items():
+            if record.expires_at > now and (
+                not self._max_records or len(self._records) - len(removed) <= self._max_records
+            ):
+                break
+            removed.append(key)
+        for key in removed:
             del self._records[key]
+        return removed
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from .search_index import SearchIndex
+from .segments import SegmentedTranscript
+from .session_store import SearchResult, SessionRecord, SessionStore
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    transcript TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    segments BLOB
+);
+CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at);
+"""
+# Rows indexed per sync step, so a search never waits on a long catch-up.
+_SYNC_BATCH = 200
+
+
+class SqliteSessionStore(SessionStore):
+    """Session storage in a SQLite file shared by all worker processes on a host.
+
+    Sessions created by one worker can be downloaded and searched through any other.
+    Each worker keeps its own search index and catches up on rows added by its
+    siblings (by increasing ``seq``): a bounded batch before every search, and any
+    larger backlog, such as the whole table after a restart, in a background
+    thread. Until it has caught up, searches only see the rows indexed so far.
+    Rows expired or evicted elsewhere are dropped from the index when a search runs
+    into them.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_minutes: int = 120,
+        max_records: int = 0,
+        search_index: Optional[SearchIndex] = None,
+    ) -> None:
+        super().__init__(ttl_minutes=ttl_minutes, max_records=max_records, search_index=search_index)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # WAL lets readers in other processes proceed while one of them writes.
+        self._conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._indexed_seq = 0
+        self._sync_lock = threading.Lock()
+        self._syncing = False
+        if self._index is not None:
+            self._start_background_sync()
+
+    def create(
+        self, transcript: str, summary: str, segments: Optional[SegmentedTranscript] = None
+    ) -> str:
+        session_id = uuid.uuid4().hex
+        now = datetime.now(timezone.utc)
+        packed = segments.to_bytes() if segments is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sessions (id, transcript, summary, created_at, expires_at, segments)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    session_id,
+                    transcript,
+                    summary,
+                    now.timestamp(),
+                    (now + self._ttl).timestamp(),
+                    packed,
+                ),
+            )
+            removed = self._purge_locked()
+        if self._index is not None and removed:
+            self._index.remove(removed)
+        return session_id
+
+    def get_record(self, session_id: str) -> Optional[SessionRecord]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT transcript, summary, created_at, expires_at, segments"
+                " FROM sessions WHERE id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is not None and row[3] <= datetime.now(timezone.utc).timestamp():
+                self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+                row = None
+        if row is None:
+            if self._index is not None:
+                self._index.remove([session_id])
+            return None
+        transcript, summary, created_at, expires_at, packed = row
+        return SessionRecord(
+            transcript=transcript,
+            summary=summary,
+            created_at=datetime.fromtimestamp(created_at, timezone.utc),
+            expires_at=datetime.fromtimestamp(expires_at, timezone.utc),
+            segments=SegmentedTranscript.from_bytes(transcript, packed) if packed else None,
+        )
+
+    def search(
+        self, query: str, limit: int = 10, within: Optional[Iterable[str]] = None
+    ) -> List[SearchResult]:
+        if self._index is not None:
+            self._sync_index()
+        return super().search(query, limit, within)
+
+    def _sync_index(self) -> None:
+        """Index a batch of rows added since the last sync, by this worker or any other.
+
+        Returns at once if another thread is already syncing. When more rows are
+        left than fit in one batch, a background thread indexes the rest.
+        """
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            more = self._sync_batch()
+        finally:
+            self._sync_lock.release()
+        if more:
+            self._start_background_sync()
+
+    def _sync_batch(self) -> bool:
+        """Index up to ``_SYNC_BATCH`` new rows; the caller holds ``_sync_lock``.
+
+        Returns whether more rows may be waiting.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, id, transcript, summary FROM sessions"
+                " WHERE seq > ? AND expires_at > ? ORDER BY seq LIMIT ?",
+                (self._indexed_seq, datetime.now(timezone.utc).timestamp(), _SYNC_BATCH),
+            ).fetchall()
+        for seq, session_id, transcript, summary in rows:
+            self._index.add(session_id, f"{transcript}\n{summary}")
+            self._indexed_seq = seq
+        return len(rows) == _SYNC_BATCH
+
+    def _start_background_sync(self) -> None:
+        with self._lock:
+            if self._syncing:
+                return
+            self._syncing = True
+        threading.Thread(
+            target=self._sync_in_background, name="session-index-sync", daemon=True
+        ).start()
+
+    def _sync_in_background(self) -> None:
+        try:
+            more = True
+            while more:
+                with self._sync_lock:
+                    more = self._sync_batch()
+        finally:
+            with self._lock:
+                self._syncing = False
+
+    def _purge_locked(self) -> List[str]:
+        now = datetime.now(timezone.utc).timestamp()
+        removed = [
+            row[0]
+            for row in self._conn.execute("SELECT id FROM sessions WHERE expires_at <= ?", (now,))
+        ]
+        if self._max_records:
+            removed += [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT id FROM sessions WHERE expires_at > ? ORDER BY seq DESC LIMIT -1 OFFSET ?",
+                    (now, self._max_records),
+                )
+            ]
+        if removed:
+            self._conn.executemany("DELETE FROM sessions WHERE id = ?", ((key,) for key in removed))
+        return removed
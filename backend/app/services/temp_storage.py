@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Every lease directory carries this prefix so the sweeper never touches files it
+# did not create, even when TRANSCRIPTION_TEMP_DIR points at a shared directory.
+LEASE_PREFIX = "tb-"
+# Written into every disk lease with its reserved byte count, so the usage scan of
+# sibling worker processes counts the reservation before the files are written.
+_RESERVATION = ".reserved"
+
+
+class StorageQuotaExceeded(Exception):
+    """Raised when accepting more temporary data would exceed the storage quota."""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class TempArtifact:
+    path: Path
+    owner: str
+    created_at: float
+
+
+@dataclass
+class TempLease:
+    """Temporary files and directories owned by a single request.
+
+    Everything is created inside the lease directory, so ``release`` removes all of
+    it in one go. Leases are tracked by their manager until released.
+    """
+
+    owner: str
+    directory: Path
+    reserved_bytes: int
+    in_memory: bool
+    _manager: "TempStorageManager" = field(repr=False)
+    artifacts: List[TempArtifact] = field(default_factory=list)
+    released: bool = False
+
+    def new_file(self, suffix: str = "") -> Path:
+        fd, name = tempfile.mkstemp(suffix=suffix, dir=self.directory)
+        os.close(fd)
+        return self._track(Path(name))
+
+    def new_dir(self) -> Path:
+        return self._track(Path(tempfile.mkdtemp(dir=self.directory)))
+
+    def release(self) -> None:
+        self._manager.release(self)
+
+    def _track(self, path: Path) -> Path:
+        self.artifacts.append(TempArtifact(path=path, owner=self.owner, created_at=time.time()))
+        return path
+
+
+class TempStorageManager:
+    """Owns the temporary audio area: leases, disk quota and orphan cleanup."""
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        quota_mb: int = 0,
+        min_free_mb: int = 0,
+        memory_dir: Optional[str] = None,
+        memory_quota_mb: int = 0,
+        memory_max_file_mb: int = 0,
+        orphan_max_age_minutes: int = 60,
+        retry_after_seconds: int = 30,
+        usage_cache_seconds: float = 2.0,
+    ) -> None:
+        self._root = Path(root) if root else Path(tempfile.gettempdir()) / "transcribly"
+        self._quota_bytes = max(quota_mb, 0) * 1024 * 1024
+        self._min_free_bytes = max(min_free_mb, 0) * 1024 * 1024
+        self._memory_dir = Path(memory_dir) if memory_dir else None
+        self._memory_quota_bytes = max(memory_quota_mb, 0) * 1024 * 1024
+        self._memory_max_file_bytes = max(memory_max_file_mb, 0) * 1024 * 1024
+        self._orphan_max_age = orphan_max_age_minutes * 60
+        self._retry_after = max(retry_after_seconds, 1)
+        self._usage_cache_seconds = usage_cache_seconds
+        self._leases: Dict[Path, TempLease] = {}
+        self._lock = threading.Lock()
+        self._usage_cache: tuple[float, Dict[Path, int]] = (0.0, {})
+
+        if self._memory_dir and not self._memory_dir.is_dir():
+            logger.warning("RAM temp directory %s does not exist; disabling it", self._memory_dir)
+            self._memory_dir = None
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def check_admission(self, expected_bytes: int) -> None:
+        """Raise ``StorageQuotaExceeded`` if ``expected_bytes`` more would not fit on disk."""
+        with self._lock:
+            self._check_disk_locked(expected_bytes)
+
+    def acquire(self, owner: str, expected_bytes: int) -> TempLease:
+        """Reserve space for ``owner`` and create its lease directory.
+
+        Small artifacts go to the RAM-backed directory when one is configured and it
+        has room; everything else is admitted against the disk quota.
+        """
+        expected_bytes = max(expected_bytes, 0)
+        with self._lock:
+            in_memory = self._fits_in_memory_locked(expected_bytes)
+            if not in_memory:
+                self._check_disk_locked(expected_bytes)
+            base = self._memory_dir if in_memory and self._memory_dir else self._root
+            base.mkdir(parents=True, exist_ok=True)
+            directory = Path(tempfile.mkdtemp(prefix=f"{LEASE_PREFIX}{_safe_owner(owner)}-", dir=base))
+            if not in_memory:
+                _write_reservation(directory, expected_bytes)
+            lease = TempLease(
+                owner=owner,
+                directory=directory,
+                reserved_bytes=expected_bytes,
+                in_memory=in_memory,
+                _manager=self,
+            )
+            self._leases[directory] = lease
+            return lease
+
+    def acquire_named(self, name: str, owner: str, expected_bytes: int) -> TempLease:
+        """Create a lease at the fixed path ``<root>/tb-<name>``.
+
+        Named leases outlive a single request (e.g. resumable uploads), so they always
+        live on disk where any worker process can find them again with ``adopt``.
+        """
+        expected_bytes = max(expected_bytes, 0)
+        with self._lock:
+            self._check_disk_locked(expected_bytes)
+            directory = self._root / f"{LEASE_PREFIX}{name}"
+            directory.mkdir(parents=True)
+            _write_reservation(directory, expected_bytes)
+            lease = TempLease(
+                owner=owner,
+                directory=directory,
+                reserved_bytes=expected_bytes,
+                in_memory=False,
+                _manager=self,
+            )
+            self._leases[directory] = lease
+            return lease
+
+    def adopt(self, name: str, owner: str, reserved_bytes: int) -> Optional[TempLease]:
+        """Track an existing named lease, e.g. one created by another worker."""
+        directory = self._root / f"{LEASE_PREFIX}{name}"
+        with self._lock:
+            if directory in self._leases:
+                return self._leases[directory]
+            if not directory.is_dir():
+                return None
+            lease = TempLease(
+                owner=owner,
+                directory=directory,
+                reserved_bytes=max(reserved_bytes, 0),
+                in_memory=False,
+                _manager=self,
+            )
+            self._leases[directory] = lease
+            return lease
+
+    def release(self, lease: TempLease) -> None:
+        with self._lock:
+            if lease.released:
+                return
+            lease.released = True
+            self._leases.pop(lease.directory, None)
+        shutil.rmtree(lease.directory, ignore_errors=True)
+
+    def active_leases(self) -> List[TempLease]:
+        with self._lock:
+            return list(self._leases.values())
+
+    def sweep_orphans(self) -> int:
+        """Delete lease directories left behind by crashed requests or processes.
+
+        A directory is an orphan when no live lease in this process owns it and nothing
+        inside it has been modified for ``orphan_max_age_minutes``. The age check keeps
+        the sweeper from deleting directories that belong to sibling worker processes.
+        """
+        removed = 0
+        cutoff = time.time() - self._orphan_max_age
+        for base in filter(None, (self._root, self._memory_dir)):
+            if not base.is_dir():
+                continue
+            for entry in base.iterdir():
+                if not entry.name.startswith(LEASE_PREFIX):
+                    continue
+                with self._lock:
+                    if entry in self._leases:
+                        continue
+                if _last_modified(entry) > cutoff:
+                    continue
+                if entry.is_dir():
+                    shutil.rmtree(entry, ignore_errors=True)
+                else:
+                    entry.unlink(missing_ok=True)
+                removed += 1
+        if removed:
+            logger.info("Removed %d orphaned temp artifacts", removed)
+        return removed
+
+    def _fits_in_memory_locked(self, expected_bytes: int) -> bool:
+        if not self._memory_dir or not expected_bytes or expected_bytes > self._memory_max_file_bytes:
+            return False
+        in_use = sum(lease.reserved_bytes for lease in self._leases.values() if lease.in_memory)
+        return in_use + expected_bytes <= self._memory_quota_bytes
+
+    def _check_disk_locked(self, expected_bytes: int) -> None:
+        if self._quota_bytes:
+            # Every lease counts with its files or its reservation, whichever is larger.
+            # The scan covers other workers' leases through their reservation files;
+            # this process's own reservations are always current.
+            usage = dict(self._measured_usage_locked())
+            for lease in self._leases.values():
+                if not lease.in_memory:
+                    usage[lease.directory] = max(
+                        usage.get(lease.directory, 0), lease.reserved_bytes
+                    )
+            projected = sum(usage.values()) + expected_bytes
+            if projected > self._quota_bytes:
+                raise StorageQuotaExceeded(
+                    "Temporary storage is full; please retry shortly.", self._retry_after
+                )
+        if self._min_free_bytes:
+            probe = self._root if self._root.exists() else self._root.parent
+            free = shutil.disk_usage(probe).free
+            if free - expected_bytes < self._min_free_bytes:
+                raise StorageQuotaExceeded(
+                    "Not enough free disk space; please retry shortly.", self._retry_after
+                )
+
+    def _measured_usage_locked(self) -> Dict[Path, int]:
+        """Bytes used by each lease on disk, counting reservations not yet filled."""
+        checked_at, usage = self._usage_cache
+        now = time.monotonic()
+        if now - checked_at < self._usage_cache_seconds:
+            return usage
+        usage = {}
+        if self._root.is_dir():
+            for entry in self._root.iterdir():
+                if entry.name.startswith(LEASE_PREFIX):
+                    usage[entry] = max(_disk_usage(entry), _read_reservation(entry))
+        self._usage_cache = (now, usage)
+        return usage
+
+
+def _safe_owner(owner: str) -> str:
+    cleaned = "".join(ch if ch.isalnum() else "-" for ch in owner)[:32]
+    return cleaned or uuid.uuid4().hex[:8]
+
+
+def _write_reservation(directory: Path, reserved_bytes: int) -> None:
+    (directory / _RESERVATION).write_text(str(reserved_bytes), encoding="ascii")
+
+
+def _read_reservation(directory: Path) -> int:
+    try:
+        return int((directory / _RESERVATION).read_text(encoding="ascii"))
+    except (OSError, ValueError):
+        return 0
+
+
+def _disk_usage(path: Path) -> int:
+    try:
+        if path.is_file():
+            return path.stat().st_size
+        return sum(child.stat().st_size for child in path.rglob("*") if child.is_file())
+    except OSError:
+        return 0
+
+
+def _last_modified(path: Path) -> float:
+    """Newest mtime of ``path`` and everything below it.
+
+    Downloads write into nested directories (``<lease>/tmpXXXX/<id>.part``), so a
+    slow download only shows up as activity when the whole tree is checked.
+    """
+    try:
+        latest = path.stat().st_mtime
+    except OSError:
+        return 0.0
+    if path.is_dir():
+        for root, dirs, files in os.walk(path):
+            for name in dirs + files:
+                try:
+                    latest = max(latest, os.stat(os.path.join(root, name)).st_mtime)
+                except OSError:
+                    continue
+    return latest
@@ -1,21 +1,43 @@
 from __future__ import annotations
 
 import asyncio
-import os
-import tempfile
+import logging
+import sys
+import time
+import uuid
 from pathlib import Path
-from typing import Optional
-
-import assemblyai as aai
-from fastapi import UploadFile
+from typing import Dict, List, Optional
 
 from ..config import settings
 from ..options import RequestOptions
 from .openai_client import AssemblyAIClientProvider, OpenAIClientProvider
+from .provider_router import ProviderRouter
+from .segments import SegmentedTranscript, group_words
+from .temp_storage import TempStorageManager
+
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("openai", "assemblyai")
+
+# OpenAI models that accept ``response_format="verbose_json"`` with segment timestamps;
+# the gpt-4o transcription models only return plain text.
+_VERBOSE_JSON_MODEL_PREFIXES = ("whisper",)
+# Largest file each provider accepts; larger files are routed to the others.
+_MAX_FILE_BYTES = {"openai": 25 * 1024 * 1024}
 
 
 class TranscriptionError(Exception):
-    """Raised when audio transcription fails."""
+    """Raised when audio transcription fails.
+
+    ``transient`` marks failures of the provider itself (timeouts, connection errors,
+    rate limiting, 5xx responses). Only those count against its circuit breaker and fail over to
+    another provider; a bad API key or rejected audio would fail there too.
+    """
+
+    def __init__(self, message: str, transient: bool = False) -> None:
+        super().__init__(message)
+        self.transient = transient
 
 
 class TranscriptionService:
@@ -23,78 +45,172 @@ class TranscriptionService:
 
     def __init__(
         self,
-        temp_dir: Optional[str] = settings.temp_dir,
-        max_upload_size_mb: int = settings.max_upload_size_mb,
         client_provider: Optional[OpenAIClientProvider] = None,
         assembly_client_provider: Optional[AssemblyAIClientProvider] = None,
+        router: Optional[ProviderRouter] = None,
     ) -> None:
-        self._temp_dir = Path(temp_dir) if temp_dir else Path(tempfile.gettempdir())
-        self._max_upload_bytes = max_upload_size_mb * 1024 * 1024
+        self._router = router or ProviderRouter()
         self._client_provider = client_provider or OpenAIClientProvider()
         self._assembly_provider = assembly_client_provider or AssemblyAIClientProvider()
 
-    async def transcribe_upload(self, upload: UploadFile, options: RequestOptions) -> str:
-        filename = upload.filename or "audio"
-        suffix = Path(filename).suffix or ".mp3"
+    async def transcribe_path(
+        self, file_path: Path | str, options: RequestOptions
+    ) -> SegmentedTranscript:
+        path = Path(file_path)
+        if not path.exists():
+            raise TranscriptionError(f"Audio file not found: {path}")
+        size = path.stat().st_size
+        candidates = self._candidate_providers(options)
+        accepted = [name for name in candidates if size <= _MAX_FILE_BYTES.get(name, size)]
+        if not accepted:
+            limit = _MAX_FILE_BYTES[candidates[0]] // (1024 * 1024)
+            raise TranscriptionError(
+                f"Audio file is {size / (1024 * 1024):.0f} MB; {candidates[0]} accepts at most "
+                f"{limit} MB per file."
+            )
+        if accepted[0] != candidates[0]:
+            logger.info("Audio file too large for %s; using %s", candidates[0], accepted[0])
+        return await self._transcribe_routed(path, options, self._router.order(accepted))
+
+    def _candidate_providers(self, options: RequestOptions) -> List[str]:
+        """The requested provider first, then any other provider that has credentials.
+
+        Callers who bring their own key for the requested provider only fail over to
+        providers they also sent a key for, so their audio is never sent to (and
+        billed by) a provider they did not pick.
+        """
+        preferred = options.resolved_transcription_provider()
+        candidates = [preferred]
+        if not self._router.failover:
+            return candidates
+        own_keys_only = _request_key(options, preferred) is not None
+        for provider in PROVIDERS:
+            if provider == preferred:
+                continue
+            if own_keys_only and _request_key(options, provider) is None:
+                continue
+            try:
+                if provider == "assemblyai":
+                    options.resolved_assembly_api_key()
+                else:
+                    options.resolved_api_key()
+            except ValueError:
+                continue
+            candidates.append(provider)
+        return candidates
+
+    async def _transcribe_routed(
+        self, path: Path, options: RequestOptions, providers: List[str]
+    ) -> SegmentedTranscript:
+        """Try ``providers`` in order, hedging slow calls and failing over on errors.
+
+        With hedging enabled, the next provider is started once the running one
+        exceeds its hedge delay; the first good result wins and the other call is
+        cancelled. The cancelled provider's worker thread still runs to completion
+        in the background, but its result is discarded.
+        """
+        size_mb = path.stat().st_size / (1024 * 1024)
+        queue = list(providers)
+        pending: Dict[asyncio.Task[SegmentedTranscript], str] = {}
+        errors: List[tuple[str, TranscriptionError]] = []
 
-        loop = asyncio.get_running_loop()
-        temp_path: Optional[Path] = None
+        def launch() -> None:
+            provider = queue.pop(0)
+            task = asyncio.create_task(self._transcribe_with(provider, path, options, size_mb))
+            pending[task] = provider
+
+        launch()
         try:
-            temp_path = await loop.run_in_executor(
-                None, self._write_temp_file, upload, suffix
-            )
-            return await self.transcribe_path(temp_path, options)
+            while pending:
+                timeout = None
+                if self._router.hedge and queue and len(pending) == 1:
+                    timeout = self._router.hedge_delay(next(iter(pending.values())), size_mb)
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    logger.info("Hedging transcription with %s after %.1fs", queue[0], timeout)
+                    launch()
+                    continue
+                for task in done:
+                    provider = pending.pop(task)
+                    try:
+                        return task.result()
+                    except TranscriptionError as exc:
+                        errors.append((provider, exc))
+                        if not exc.transient:
+                            # The request itself was rejected; a running hedge may
+                            # still succeed, but nothing new is started.
+                            queue.clear()
+                if not pending and queue:
+                    logger.warning("Failing over transcription to %s", queue[0])
+                    launch()
         finally:
-            if temp_path:
-                await asyncio.to_thread(self._safe_unlink, temp_path)
-            await upload.close()
+            for task in pending:
+                task.cancel()
 
-    async def transcribe_path(self, file_path: Path | str, options: RequestOptions) -> str:
-        path = Path(file_path)
-        if not path.exists():
-            raise TranscriptionError(f"Audio file not found: {path}")
-        provider = options.resolved_transcription_provider()
+        if len(errors) == 1:
+            raise errors[0][1]
+        details = "; ".join(f"{provider}: {exc}" for provider, exc in errors)
+        raise TranscriptionError(f"All transcription providers failed. {details}")
+
+    async def _transcribe_with(
+        self, provider: str, path: Path, options: RequestOptions, size_mb: float
+    ) -> SegmentedTranscript:
         if provider == "assemblyai":
-            return await asyncio.to_thread(self._transcribe_with_assemblyai, path, options)
-        return await asyncio.to_thread(self._transcribe_with_openai, path, options)
-
-    def _write_temp_file(self, upload: UploadFile, suffix: str) -> Path:
-        upload.file.seek(0)
-        total = 0
-        os.makedirs(self._temp_dir, exist_ok=True)
-        with tempfile.NamedTemporaryFile(
-            delete=False, suffix=suffix, dir=self._temp_dir
-        ) as temp_file:
-            while True:
-                chunk = upload.file.read(1024 * 1024)
-                if not chunk:
-                    break
-                total += len(chunk)
-                if total > self._max_upload_bytes:
-                    raise ValueError(
-                        f"File exceeds maximum size of {self._max_upload_bytes / (1024 * 1024):.0f} MB"
-                    )
-                temp_file.write(chunk)
-            return Path(temp_file.name)
-
-    def _transcribe_with_openai(self, file_path: Path, options: RequestOptions) -> str:
+            transcribe = self._transcribe_with_assemblyai
+        else:
+            transcribe = self._transcribe_with_openai
+        trial = self._router.acquire(provider)
+        started = time.monotonic()
+        try:
+            result = await asyncio.to_thread(transcribe, path, options)
+        except TranscriptionError as exc:
+            if exc.transient:
+                self._router.record_failure(provider)
+            elif trial:
+                self._router.release(provider)
+            raise
+        except BaseException:
+            if trial:
+                self._router.release(provider)
+            raise
+        self._router.record_success(provider, time.monotonic() - started, size_mb)
+        return result
+
+    def _transcribe_with_openai(
+        self, file_path: Path, options: RequestOptions
+    ) -> SegmentedTranscript:
         client = self._client_provider.create_client(options.resolved_api_key())
+        model = options.resolved_stt_model()
+        request: dict[str, object] = {"model": model}
+        if model.lower().startswith(_VERBOSE_JSON_MODEL_PREFIXES):
+            request["response_format"] = "verbose_json"
+            request["timestamp_granularities"] = ["segment"]
 
         try:
             with file_path.open("rb") as audio_file:
-                response = client.audio.transcriptions.create(
-                    model=options.resolved_stt_model(),
-                    file=audio_file,
-                )
+                response = client.audio.transcriptions.create(file=audio_file, **request)
         except Exception as exc:  # pragma: no cover - API error handling
-            raise TranscriptionError(f"Transcription request failed: {exc}") from exc
+            raise TranscriptionError(
+                f"Transcription request failed: {exc}", transient=_is_transient(exc)
+            ) from exc
 
-        text = getattr(response, "text", None) or getattr(response, "output_text", None)
-        if not text:
+        segments = getattr(response, "segments", None)
+        if segments:
+            transcript = SegmentedTranscript.from_segments(
+                (segment.start, segment.end, segment.text, None) for segment in segments
+            )
+        else:
+            text = getattr(response, "text", None) or getattr(response, "output_text", None)
+            transcript = SegmentedTranscript.from_text(text or "")
+        if not transcript.text:
             raise TranscriptionError("Received empty transcript from transcription API.")
-        return text.strip()
+        return transcript
 
-    def _transcribe_with_assemblyai(self, file_path: Path, options: RequestOptions) -> str:
+    def _transcribe_with_assemblyai(
+        self, file_path: Path, options: RequestOptions
+    ) -> SegmentedTranscript:
         if not self._assembly_provider:
             raise TranscriptionError("AssemblyAI transcription provider is not configured.")
 
@@ -103,28 +219,64 @@ class TranscriptionService:
         except ValueError as exc:
             raise TranscriptionError(str(exc)) from exc
 
-        config = aai.TranscriptionConfig(speech_model=options.resolved_assembly_model())
+        import assemblyai as aai
+
+        config = aai.TranscriptionConfig(
+            speech_model=options.resolved_assembly_model(),
+            speaker_labels=settings.assemblyai_speaker_labels or None,
+        )
 
         try:
             transcript = transcriber.transcribe(str(file_path), config=config)
         except Exception as exc:  # pragma: no cover - API error handling
-            raise TranscriptionError(f"AssemblyAI transcription failed: {exc}") from exc
+            raise TranscriptionError(
+                f"AssemblyAI transcription failed: {exc}", transient=_is_transient(exc)
+            ) from exc
 
         if transcript.status == aai.TranscriptStatus.error:
             raise TranscriptionError(f"AssemblyAI transcription failed: {transcript.error}")
         if not transcript.text:
             raise TranscriptionError("Received empty transcript from AssemblyAI.")
-        return transcript.text.strip()
 
-    @staticmethod
-    def _safe_unlink(path: Path) -> None:
-        if not path:
-            return
-        try:
-            path.unlink(missing_ok=True)  # type: ignore[call-arg]
-        except TypeError:
-            if path.exists():
-                path.unlink()
+        # AssemblyAI reports times in milliseconds.
+        if transcript.utterances:
+            return SegmentedTranscript.from_segments(
+                (item.start / 1000, item.end / 1000, item.text, item.speaker)
+                for item in transcript.utterances
+            )
+        if transcript.words:
+            return SegmentedTranscript.from_segments(
+                group_words(
+                    (word.start / 1000, word.end / 1000, word.text, word.speaker)
+                    for word in transcript.words
+                )
+            )
+        return SegmentedTranscript.from_text(transcript.text)
+
+
+def _request_key(options: RequestOptions, provider: str) -> Optional[str]:
+    """The caller's own API key for ``provider``, if the request carried one."""
+    return options.assembly_api_key if provider == "assemblyai" else options.api_key
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Whether a provider SDK error points at the provider rather than the request.
+
+    Both SDKs expose the HTTP status as ``status_code``; connection failures and
+    timeouts surface as ``openai.APIConnectionError`` or httpx transport errors.
+    Rate limiting (429) is the provider's capacity, not the request's fault.
+    """
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        return status >= 500 or status == 429
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    # Only look at SDKs that are already loaded; one of them raised ``exc``.
+    openai = sys.modules.get("openai")
+    if openai is not None and isinstance(exc, openai.APIConnectionError):
+        return True
+    httpx = sys.modules.get("httpx")
+    return httpx is not None and isinstance(exc, httpx.TransportError)
 
 
 async def transcribe_audio(
@@ -146,16 +298,12 @@ async def transcribe_audio(
     )
     service = TranscriptionService()
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp_file:
-        tmp_file.write(file_bytes)
-        tmp_file.flush()
-        temp_path = Path(tmp_file.name)
-
+    temp_storage = TempStorageManager(root=settings.temp_dir or None)
+    lease = temp_storage.acquire(f"bytes-{uuid.uuid4().hex}", len(file_bytes))
     try:
-        return await service.transcribe_path(temp_path, options)
+        temp_path = lease.new_file(".mp3")
+        temp_path.write_bytes(file_bytes)
+        transcript = await service.transcribe_path(temp_path, options)
+        return transcript.text
     finally:
-        try:
-            temp_path.unlink(missing_ok=True)  # type: ignore[call-arg]
-        except TypeError:
-            if temp_path.exists():
-                temp_path.unlink()
+        await asyncio.to_thread(lease.release)
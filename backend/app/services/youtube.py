@@ -1,34 +1,174 @@
 from __future__ import annotations
 
 import asyncio
-import tempfile
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
-try:
+from .temp_storage import TempLease
+
+if TYPE_CHECKING:  # pragma: no cover - imported lazily to keep startup fast
     import yt_dlp
-except ImportError as exc:  # pragma: no cover - optional dependency
-    raise RuntimeError(
-        "YouTube audio support requires the `yt-dlp` package. "
-        "Install it with `pip install yt-dlp`."
-    ) from exc
+
+
+_NESTED_PLAYLIST_DEPTH = 2
+
+
+def load_yt_dlp() -> ModuleType:
+    """Import yt-dlp on first use; its extractor registry is slow to load."""
+    try:
+        import yt_dlp
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError(
+            "YouTube audio support requires the `yt-dlp` package. "
+            "Install it with `pip install yt-dlp`."
+        ) from exc
+    return yt_dlp
+
+
+@dataclass
+class PlaylistEntry:
+    """A single video discovered while expanding a playlist or channel."""
+
+    video_id: str
+    url: str
+    title: Optional[str] = None
+    duration: Optional[float] = None
+
+
+class TokenBucket:
+    """Bandwidth cap shared by every download thread in the process.
+
+    Downloads report the bytes they received and sleep until the bucket has paid for
+    them, so concurrent downloads split ``rate_bytes`` per second between them.
+    """
+
+    def __init__(self, rate_bytes: int, burst_bytes: Optional[int] = None) -> None:
+        self._rate = rate_bytes
+        self._capacity = burst_bytes if burst_bytes is not None else rate_bytes
+        self._tokens = float(self._capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount: int) -> None:
+        """Take ``amount`` bytes, blocking the calling thread until they are covered."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            # Going into debt queues later callers behind this one.
+            self._tokens -= amount
+            wait = -self._tokens / self._rate
+        if wait > 0:
+            time.sleep(wait)
 
 
 class YouTubeAudioService:
     """Downloads audio tracks from YouTube URLs for transcription."""
 
-    def __init__(self, output_dir: Optional[str], fmt: str = "bestaudio/best") -> None:
+    def __init__(
+        self,
+        fmt: str = "bestaudio/best",
+        rate_limit_bytes: Optional[int] = None,
+    ) -> None:
         self._format = fmt
-        self._base_dir = Path(output_dir) if output_dir else Path(tempfile.gettempdir())
+        self._bandwidth = TokenBucket(rate_limit_bytes) if rate_limit_bytes else None
 
-    async def download_audio(self, url: str) -> Path:
+    async def download_audio(self, url: str, lease: TempLease) -> Path:
+        """Download into ``lease``; releasing the lease removes the audio again."""
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._download_blocking, url)
+        return await loop.run_in_executor(None, self._download_blocking, url, lease)
+
+    async def list_playlist_entries(
+        self, url: str, max_items: Optional[int] = None
+    ) -> List[PlaylistEntry]:
+        """Expand a playlist or channel URL into its videos without downloading them."""
+        return await asyncio.to_thread(self._list_entries_blocking, url, max_items)
+
+    def _list_entries_blocking(self, url: str, max_items: Optional[int]) -> List[PlaylistEntry]:
+        ydl_opts: Dict[str, Any] = {
+            "quiet": True,
+            "extract_flat": "in_playlist",
+            "skip_download": True,
+            "nocheckcertificate": True,
+            "ignoreerrors": True,
+            "cachedir": False,
+        }
+        if max_items:
+            ydl_opts["playlistend"] = max_items
+
+        yt_dlp = load_yt_dlp()
+        entries: List[PlaylistEntry] = []
+        seen: set[str] = set()
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+            if not info:
+                raise ValueError("Failed to read playlist information from the provided URL.")
+            self._collect_entries(ydl, info, entries, seen, max_items, _NESTED_PLAYLIST_DEPTH)
+
+        if not entries:
+            raise ValueError("No videos were found for the provided playlist or channel URL.")
+        return entries
 
-    def _download_blocking(self, url: str) -> Path:
-        temp_dir = Path(tempfile.mkdtemp(dir=self._base_dir))
+    def _collect_entries(
+        self,
+        ydl: "yt_dlp.YoutubeDL",
+        info: Dict[str, Any],
+        entries: List[PlaylistEntry],
+        seen: set[str],
+        max_items: Optional[int],
+        depth: int,
+    ) -> None:
+        """Walk flat extraction results, descending into channel tabs and nested playlists."""
+        if info.get("_type") not in {"playlist", "multi_video"}:
+            self._append_entry(info, entries, seen)
+            return
+
+        for item in info.get("entries") or []:
+            if max_items and len(entries) >= max_items:
+                return
+            if not item:
+                continue
+            is_nested = item.get("_type") == "playlist" or (
+                item.get("_type") == "url" and item.get("ie_key") == "YoutubeTab"
+            )
+            if not is_nested:
+                self._append_entry(item, entries, seen)
+                continue
+            if depth <= 0:
+                continue
+            nested = item
+            if not item.get("entries"):
+                nested = ydl.extract_info(item.get("url") or item.get("webpage_url"), download=False)
+                if not nested:
+                    continue
+            self._collect_entries(ydl, nested, entries, seen, max_items, depth - 1)
+
+    @staticmethod
+    def _append_entry(item: Dict[str, Any], entries: List[PlaylistEntry], seen: set[str]) -> None:
+        video_id = item.get("id")
+        if not video_id or video_id in seen:
+            return
+        url = item.get("webpage_url") or item.get("url") or ""
+        if not url.startswith("http"):
+            url = f"https://www.youtube.com/watch?v={video_id}"
+        seen.add(video_id)
+        entries.append(
+            PlaylistEntry(
+                video_id=video_id,
+                url=url,
+                title=item.get("title"),
+                duration=item.get("duration"),
+            )
+        )
+
+    def _download_blocking(self, url: str, lease: TempLease) -> Path:
+        temp_dir = lease.new_dir()
         output_template = str(temp_dir / "%(id)s.%(ext)s")
-        ydl_opts = {
+        ydl_opts: Dict[str, Any] = {
             "format": self._format,
             "outtmpl": output_template,
             "quiet": True,
@@ -44,7 +184,10 @@ class YouTubeAudioService:
                 }
             ],
         }
+        if self._bandwidth is not None:
+            ydl_opts["progress_hooks"] = [_throttle(self._bandwidth)]
 
+        yt_dlp = load_yt_dlp()
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             info = ydl.extract_info(url, download=True)
             if not info:
@@ -59,20 +202,19 @@ class YouTubeAudioService:
             return final_path
         raise FileNotFoundError("Audio download completed but file was not found.")
 
-    async def cleanup_path(self, path: Path) -> None:
-        await asyncio.to_thread(self._cleanup_blocking, path)
 
-    def _cleanup_blocking(self, path: Path) -> None:
-        if not path:
+def _throttle(bucket: TokenBucket) -> Callable[[Dict[str, Any]], None]:
+    """A yt-dlp progress hook that charges each received block to ``bucket``."""
+    received: Dict[Optional[str], int] = {}
+
+    def hook(progress: Dict[str, Any]) -> None:
+        if progress.get("status") != "downloading":
             return
-        directory = path.parent if path.exists() else path
-        if directory.exists():
-            for child in directory.iterdir():
-                try:
-                    child.unlink()
-                except IsADirectoryError:
-                    self._cleanup_blocking(child)
-            try:
-                directory.rmdir()
-            except OSError:
-                pass
+        filename = progress.get("filename")
+        total = progress.get("downloaded_bytes") or 0
+        delta = total - received.get(filename, 0)
+        received[filename] = total
+        if delta > 0:
+            bucket.consume(delta)
+
+    return hook
@@ -0,0 +1,129 @@
+"""Benchmark JSON encoding and response compression for long transcripts.
+
+Builds synthetic transcripts for recordings of the given lengths (about 150
+spoken words per minute, one segment every 5 seconds) and reports:
+
+* encode time of a ``TranscriptionResponse`` through FastAPI's default path
+  (response_model validation, ``jsonable_encoder``, stdlib ``json``) versus
+  ``trusted_response`` with orjson and with its stdlib fallback;
+* bytes on the wire and compression time for the JSON body and the SRT export
+  with each available encoding, at the levels the middleware uses.
+
+Usage (from the ``backend`` directory)::
+
+    python scripts/bench_serialization.py --hours 1 3 6
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app import serialization  # noqa: E402
+from app.compression import load_encoders  # noqa: E402
+from app.models import TranscriptionResponse  # noqa: E402
+from app.services import SegmentedTranscript  # noqa: E402
+
+WORDS_PER_MINUTE = 150
+VOCABULARY = [f"w{index}" for index in range(3000)] + ["the", "and", "a", "to", "of", "in"] * 200
+
+
+def build_transcript(hours: float) -> SegmentedTranscript:
+    rng = random.Random(11)
+    words_per_segment = WORDS_PER_MINUTE // 12
+    segments = []
+    for index in range(int(hours * 3600 / 5)):
+        text = " ".join(rng.choices(VOCABULARY, k=words_per_segment)).capitalize() + "."
+        segments.append((index * 5.0, index * 5.0 + 5.0, text, None))
+    return SegmentedTranscript.from_segments(segments)
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    """Median wall time of ``fn`` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, nargs="+", default=[1.0, 3.0, 6.0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    field = create_response_field("Response_transcription", TranscriptionResponse)
+    encoders = load_encoders(("gzip", "br", "zstd"))
+    orjson = serialization.orjson
+
+    loop = asyncio.new_event_loop()
+
+    def default_path(model: TranscriptionResponse) -> bytes:
+        content = loop.run_until_complete(serialize_response(field=field, response_content=model))
+        return JSONResponse(content).body
+
+    def trusted_stdlib(model: TranscriptionResponse) -> bytes:
+        serialization.orjson = None
+        try:
+            return serialization.trusted_response(model).body
+        finally:
+            serialization.orjson = orjson
+
+    print("Encoding TranscriptionResponse (median ms)")
+    print(f"{'hours':>6} {'body KB':>9} {'default':>9} {'trusted+stdlib':>15} {'trusted+orjson':>15}")
+    bodies = {}
+    for hours in args.hours:
+        transcript = build_transcript(hours)
+        model = TranscriptionResponse(
+            session_id="0" * 32, transcript=transcript.text, summary="Summary. " * 40
+        )
+        body = serialization.trusted_response(model).body
+        bodies[hours] = (body, "".join(transcript.iter_srt()).encode("utf-8"))
+        default_ms = timed(lambda: default_path(model), args.repeat)
+        stdlib_ms = timed(lambda: trusted_stdlib(model), args.repeat)
+        fast_ms = (
+            f"{timed(lambda: serialization.trusted_response(model).body, args.repeat):>15.2f}"
+            if orjson is not None
+            else f"{'n/a':>15}"
+        )
+        print(f"{hours:>6g} {len(body) / 1024:>9.0f} {default_ms:>9.2f} {stdlib_ms:>15.2f} {fast_ms}")
+
+    print()
+    print("Bytes on the wire (KB) / compression time (ms)")
+    header = f"{'hours':>6} {'payload':<8} {'identity':>9}"
+    for encoder in encoders:
+        header += f" {encoder.name:>16}"
+    print(header)
+    for hours, payloads in bodies.items():
+        for name, payload in zip(("json", "srt"), payloads):
+            row = f"{hours:>6g} {name:<8} {len(payload) / 1024:>9.0f}"
+            for encoder in encoders:
+
+                def compress() -> bytes:
+                    stream = encoder.stream()
+                    return stream.compress(payload) + stream.finish()
+
+                size = len(compress())
+                elapsed = timed(compress, max(args.repeat // 4, 3))
+                row += f" {size / 1024:>7.0f} / {elapsed:>6.1f}"
+            print(row)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""Compare request throughput of the production launcher with a single uvicorn process.
+
+Seeds a SQLite session store with synthetic transcripts (shared by all workers
+through ``SESSION_STORE_PATH``), then starts the API twice on a free port:
+
+* ``single``: ``uvicorn app.main:app`` with default settings, as before;
+* ``launcher``: ``python -m app`` with ``WEB_CONCURRENCY`` workers.
+
+Each server is loaded with keep-alive GET requests from several client
+processes for ``/health``, ``/search`` and ``/download-transcript?format=json``.
+No provider API keys are needed.
+
+Usage (from the ``backend`` directory)::
+
+    python scripts/bench_server.py --workers 4 --duration 10 --concurrency 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+WORDS = [f"word{index}" for index in range(5000)]
+
+
+def seed_sessions(path: str, count: int, words: int) -> List[str]:
+    """Store ``count`` synthetic sessions and return their ids."""
+    sys.path.insert(0, str(BACKEND_DIR))
+    from app.services import SegmentedTranscript, SqliteSessionStore
+
+    store = SqliteSessionStore(path, ttl_minutes=24 * 60)
+    rng = random.Random(7)
+    weights = list(accumulate(1 / (rank + 1) for rank in range(len(WORDS))))
+    session_ids = []
+    for _ in range(count):
+        tokens = rng.choices(WORDS, cum_weights=weights, k=words)
+        segments = [
+            (index * 5.0, index * 5.0 + 5.0, " ".join(tokens[start : start + 12]), None)
+            for index, start in enumerate(range(0, len(tokens), 12))
+        ]
+        transcript = SegmentedTranscript.from_segments(segments)
+        session_ids.append(store.create(transcript.text, "Synthetic summary.", transcript))
+    return session_ids
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode: str, port: int, workers: int, env: Dict[str, str]) -> subprocess.Popen:
+    if mode == "single":
+        command = [
+            sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--no-access-log"
+        ]
+    else:
+        command = [sys.executable, "-m", "app"]
+        env = dict(env, WEB_CONCURRENCY=str(workers))
+    process = subprocess.Popen(
+        command,
+        cwd=BACKEND_DIR,
+        env=dict(env, PORT=str(port)),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/health")
+            if connection.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{mode} server did not become healthy")
+
+
+def client(port: int, path: str, threads: int, duration: float, queue) -> None:
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def run() -> None:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local: List[float] = []
+        failed = 0
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                connection.request("GET", path)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+                    continue
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    pool = [threading.Thread(target=run) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    queue.put((latencies, errors[0]))
+
+
+def load(port: int, path: str, concurrency: int, duration: float) -> Tuple[float, float, float, int]:
+    """Return requests/s, p50 ms, p99 ms and error count for ``path``."""
+    processes = max(min(os.cpu_count() or 1, concurrency), 1)
+    queue = multiprocessing.Queue()
+    clients = [
+        multiprocessing.Process(
+            target=client, args=(port, path, concurrency // processes or 1, duration, queue)
+        )
+        for _ in range(processes)
+    ]
+    for process in clients:
+        process.start()
+    latencies: List[float] = []
+    errors = 0
+    for _ in clients:
+        chunk, failed = queue.get()
+        latencies.extend(chunk)
+        errors += failed
+    for process in clients:
+        process.join()
+    if not latencies:
+        return 0.0, 0.0, 0.0, errors
+    latencies.sort()
+    p99 = latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)]
+    return len(latencies) / duration, statistics.median(latencies) * 1000, p99 * 1000, errors
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=3000, help="Words per synthetic transcript.")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="bench-server-")
+    store_path = os.path.join(workdir, "sessions.db")
+    session_ids = seed_sessions(store_path, args.sessions, args.words)
+    # /search only looks at the sessions named in the request, as a client would.
+    scope = "".join(f"&session_id={session_id}" for session_id in session_ids[:100])
+    env = dict(
+        os.environ,
+        PYTHONPATH=str(BACKEND_DIR),
+        SESSION_STORE_PATH=store_path,
+        SESSION_TTL_MINUTES=str(24 * 60),
+        TRANSCRIPTION_TEMP_DIR=os.path.join(workdir, "tmp"),
+        WARM_UP_PROVIDERS="false",
+        ADMISSION_PRIORITY_LIMIT="100000",
+        LOG_LEVEL="WARNING",
+        SERVER_ACCESS_LOG="false",
+    )
+    paths = [
+        "/health",
+        f"/search?q=word3+word40&limit=10{scope}",
+        f"/download-transcript?session_id={session_ids[-1]}&format=json",
+    ]
+
+    print(f"{'mode':<10} {'path':<22} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for mode in ("single", "launcher"):
+        port = free_port()
+        server = start_server(mode, port, args.workers, env)
+        try:
+            for path in paths:
+                load(port, path, args.concurrency, 1.0)  # warm up every worker
+                rps, p50, p99, errors = load(port, path, args.concurrency, args.duration)
+                name = path.split("?")[0]
+                print(f"{mode:<10} {name:<22} {rps:>9.0f} {p50:>8.1f} {p99:>8.1f} {errors:>7}", flush=True)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
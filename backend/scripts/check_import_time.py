@@ -0,0 +1,83 @@
+"""Check the cold import time of ``app.main`` against a budget.
+
+Runs ``python -X importtime -c "import app.main"`` several times in fresh
+interpreters and fails when the median cumulative import time exceeds the
+budget, or when a provider SDK that should be loaded lazily shows up during
+startup.
+
+Usage (from the ``backend`` directory)::
+
+    python scripts/check_import_time.py --budget-ms 400 --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "400"))
+LAZY_MODULES = ("openai", "assemblyai", "yt_dlp")
+
+
+def measure_once(target: str) -> Tuple[float, Dict[str, int]]:
+    """Return the cumulative import time of ``target`` in ms and per-module cumulative times (us)."""
+    env = dict(os.environ, PYTHONPATH=str(BACKEND_DIR), WARM_UP_PROVIDERS="false")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        modules[name] = int(cumulative)
+    if target not in modules:
+        raise RuntimeError(f"{target} did not appear in the -X importtime output")
+    return modules[target] / 1000, modules
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Show the N slowest top-level imports.")
+    args = parser.parse_args(argv)
+
+    timings: List[float] = []
+    modules: Dict[str, int] = {}
+    for _ in range(max(args.runs, 1)):
+        elapsed, modules = measure_once(args.target)
+        timings.append(elapsed)
+
+    median = statistics.median(timings)
+    print(f"{args.target}: median {median:.1f} ms over {len(timings)} runs (budget {args.budget_ms:.0f} ms)")
+    print("slowest packages:")
+    top_level = {name: value for name, value in modules.items() if "." not in name}
+    for name, value in sorted(top_level.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+        print(f"  {value / 1000:8.1f} ms  {name}")
+
+    failed = False
+    eager = [name for name in LAZY_MODULES if name in modules]
+    if eager:
+        print(f"FAIL: provider SDKs imported at startup: {', '.join(eager)}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"FAIL: import time {median:.1f} ms exceeds budget of {args.budget_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
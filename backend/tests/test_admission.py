@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+import pytest
+
+from app import main
+from app.services import AdmissionController, AdmissionRejected, SegmentedTranscript
+
+WORK = ("upload", "stt", "summarization")
+
+
+def make_controller(**overrides) -> AdmissionController:
+    values = dict(
+        limits={"upload": 2, "download": 2, "stt": 1, "summarization": 2},
+        service_times={"upload": 1.0, "download": 1.0, "stt": 10.0, "summarization": 1.0},
+        max_wait_seconds=25.0,
+        max_queue=4,
+        priority_limit=2,
+    )
+    values.update(overrides)
+    return AdmissionController(**values)
+
+
+def test_sheds_when_expected_wait_is_too_long() -> None:
+    controller = make_controller()
+    tickets = [controller.admit(WORK) for _ in range(3)]
+
+    # Three STT runs are ahead on a single slot, which alone is 30 s of waiting.
+    with pytest.raises(AdmissionRejected) as excinfo:
+        controller.admit(WORK)
+    assert excinfo.value.status_code == 503
+    assert excinfo.value.retry_after >= 30
+
+    tickets[0].release()
+    controller.admit(WORK)
+
+
+def test_sheds_with_429_when_queue_is_full() -> None:
+    controller = make_controller(max_wait_seconds=1000.0, max_queue=2)
+    for _ in range(3):
+        controller.admit(WORK)
+
+    with pytest.raises(AdmissionRejected) as excinfo:
+        controller.admit(WORK)
+    assert excinfo.value.status_code == 429
+    assert "stt" in str(excinfo.value)
+
+
+def test_priority_lane_ignores_heavy_queue() -> None:
+    controller = make_controller()
+    for _ in range(3):
+        controller.admit(WORK)
+
+    first, second = controller.admit_priority(), controller.admit_priority()
+    with pytest.raises(AdmissionRejected) as excinfo:
+        controller.admit_priority()
+    assert excinfo.value.status_code == 503
+
+    first.release()
+    first.release()  # releasing twice is harmless
+    controller.admit_priority()
+    second.release()
+
+
+def test_stages_run_in_arrival_order_under_the_limit() -> None:
+    controller = make_controller()
+    order: List[int] = []
+
+    async def run(number: int) -> None:
+        async with controller.stage("stt"):
+            order.append(number)
+            assert controller.snapshot()["stt"]["in_flight"] == 1
+            await asyncio.sleep(0.01)
+
+    async def scenario() -> None:
+        await asyncio.gather(*(run(number) for number in range(5)))
+
+    asyncio.run(scenario())
+    assert order == [0, 1, 2, 3, 4]
+    assert controller.snapshot()["stt"]["in_flight"] == 0
+
+
+def test_started_stages_leave_the_admitted_count() -> None:
+    controller = make_controller()
+
+    async def scenario() -> None:
+        ticket = controller.admit(WORK)
+        snapshot = controller.snapshot()
+        assert [snapshot[name]["admitted"] for name in WORK] == [1, 1, 1]
+
+        async with controller.stage("upload"):
+            snapshot = controller.snapshot()
+            assert (snapshot["upload"]["admitted"], snapshot["upload"]["in_flight"]) == (0, 1)
+            assert snapshot["stt"]["admitted"] == 1
+        ticket.release()
+
+    asyncio.run(scenario())
+    assert all(work_class["admitted"] == 0 for work_class in controller.snapshot().values())
+
+
+def test_streamed_download_holds_its_ticket_until_the_body_is_sent(monkeypatch) -> None:
+    controller = make_controller(priority_limit=1)
+    monkeypatch.setattr(main, "get_admission_controller", lambda: controller)
+    transcript = SegmentedTranscript.from_segments(
+        (number * 5.0, number * 5.0 + 5.0, "word " * 10, None) for number in range(5000)
+    )
+    session_id = main.get_session_store().create(transcript.text, "summary", transcript)
+    in_flight: List[int] = []
+
+    async def receive():
+        await asyncio.sleep(10)
+        return {"type": "http.disconnect"}
+
+    async def send(message) -> None:
+        if message["type"] == "http.response.body":
+            in_flight.append(controller._priority_in_flight)
+
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "path": "/download-transcript",
+        "raw_path": b"/download-transcript",
+        "query_string": f"session_id={session_id}&format=srt".encode(),
+        "headers": [],
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "client": ("client", 1),
+        "root_path": "",
+    }
+    asyncio.run(main.app(scope, receive, send))
+
+    assert len(in_flight) > 2
+    assert all(count == 1 for count in in_flight[:-1])
+    assert controller._priority_in_flight == 0
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import gzip
+import importlib.util
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.compression import CompressionMiddleware, load_encoders, negotiate
+
+TEXT = "The quick brown fox jumps over the lazy dog. " * 200
+ALL = ("zstd", "br", "gzip")
+HAS_OPTIONAL = all(importlib.util.find_spec(name) for name in ("brotli", "zstandard"))
+needs_optional = pytest.mark.skipif(not HAS_OPTIONAL, reason="brotli and zstandard not installed")
+
+
+def make_client(encodings=ALL, minimum_size: int = 1024) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, encodings=encodings, minimum_size=minimum_size)
+
+    @app.get("/text")
+    def text() -> PlainTextResponse:
+        return PlainTextResponse(TEXT)
+
+    @app.get("/small")
+    def small() -> PlainTextResponse:
+        return PlainTextResponse("tiny")
+
+    @app.get("/encoded")
+    def encoded() -> Response:
+        return Response(
+            gzip.compress(TEXT.encode()),
+            media_type="text/plain",
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    @app.get("/binary")
+    def binary() -> Response:
+        return Response(TEXT.encode(), media_type="audio/mpeg")
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        chunks = [TEXT[:100], TEXT[100:3000], TEXT[3000:]]
+        return StreamingResponse(iter(chunks), media_type="text/plain")
+
+    @app.get("/small-stream")
+    def small_stream() -> StreamingResponse:
+        return StreamingResponse(iter(["ti", "ny"]), media_type="text/plain")
+
+    return TestClient(app)
+
+
+def get(client: TestClient, path: str, accept_encoding: str):
+    return client.get(path, headers={"Accept-Encoding": accept_encoding})
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip", "gzip"),
+        ("gzip, br, zstd", "zstd"),
+        ("gzip, br", "br"),
+        ("zstd;q=0.5, br;q=0.8, gzip;q=1.0", "gzip"),
+        ("br;q=0.9, gzip;q=0.9", "br"),
+        ("zstd;q=0, *", "br"),
+        ("*;q=0.2, gzip;q=0.5", "gzip"),
+        ("identity", None),
+        ("gzip;q=0", None),
+        ("gzip;q=oops", None),
+        ("", None),
+    ],
+)
+@needs_optional
+def test_negotiate_prefers_highest_q_value_then_server_order(accept_encoding, expected) -> None:
+    encoder = negotiate(accept_encoding, load_encoders(ALL))
+
+    assert (encoder.name if encoder else None) == expected
+
+
+def test_unknown_and_unavailable_encodings_are_skipped() -> None:
+    assert [encoder.name for encoder in load_encoders(["deflate", "gzip"])] == ["gzip"]
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip", "gzip"),
+        pytest.param("br", "br", marks=needs_optional),
+        pytest.param("zstd, br, gzip", "zstd", marks=needs_optional),
+    ],
+)
+def test_response_is_compressed_with_negotiated_encoding(accept_encoding, expected) -> None:
+    response = get(make_client(), "/text", accept_encoding)
+
+    assert response.headers["content-encoding"] == expected
+    assert int(response.headers["content-length"]) < len(TEXT)
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.text == TEXT
+
+
+@pytest.mark.parametrize("accept_encoding", ["identity", "gzip;q=0", ""])
+def test_identity_response_is_sent_as_is(accept_encoding) -> None:
+    response = get(make_client(), "/text", accept_encoding)
+
+    assert "content-encoding" not in response.headers
+    assert response.text == TEXT
+
+
+def test_body_below_minimum_size_is_not_compressed() -> None:
+    client = make_client()
+
+    for path in ("/small", "/small-stream"):
+        response = get(client, path, "gzip")
+        assert "content-encoding" not in response.headers
+        assert response.text == "tiny"
+
+
+def test_already_encoded_and_binary_responses_are_untouched() -> None:
+    client = make_client()
+
+    encoded = get(client, "/encoded", "br, gzip")
+    assert encoded.headers["content-encoding"] == "gzip"
+    assert encoded.text == TEXT
+
+    binary = get(client, "/binary", "gzip")
+    assert "content-encoding" not in binary.headers
+    assert binary.content == TEXT.encode()
+
+
+def test_streaming_response_is_compressed_in_chunks() -> None:
+    with make_client(encodings=["gzip"]).stream(
+        "GET", "/stream", headers={"Accept-Encoding": "gzip"}
+    ) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw).decode() == TEXT
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.config import settings
+from app.services import AdmissionController, PlaylistEntry, SegmentedTranscript
+from app.services.youtube import TokenBucket, _throttle
+
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PL123"
+WORK = ("download", "stt", "summarization")
+
+
+def make_controller(limit: int = 8, max_queue: int = 32) -> AdmissionController:
+    return AdmissionController(
+        limits=dict.fromkeys(WORK + ("upload",), limit),
+        service_times=dict.fromkeys(WORK + ("upload",), 1.0),
+        max_wait_seconds=60.0,
+        max_queue=max_queue,
+    )
+
+
+@pytest.fixture
+def playlist(monkeypatch, tmp_path: Path):
+    """Route playlist requests through fakes; returns the admission controller used."""
+    controller = make_controller()
+    monkeypatch.setattr(main, "get_admission_controller", lambda: controller)
+    monkeypatch.setattr(settings, "youtube_playlist_concurrency", 3)
+    youtube = main.get_youtube_service()
+    transcription = main.get_transcription_service()
+    summarization = main.get_summarization_service()
+
+    async def list_entries(url, max_items):
+        return [
+            PlaylistEntry(video_id=f"v{number}", url=f"https://youtu.be/v{number}")
+            for number in range(max_items or 5)
+        ]
+
+    async def download(url, lease):
+        path = lease.new_file(".mp3")
+        path.write_text(url)
+        return path
+
+    async def transcribe(path, options):
+        return SegmentedTranscript.from_text(Path(path).read_text())
+
+    async def summarize(text, options):
+        return "summary"
+
+    monkeypatch.setattr(youtube, "list_playlist_entries", list_entries)
+    monkeypatch.setattr(youtube, "download_audio", download)
+    monkeypatch.setattr(transcription, "transcribe_path", transcribe)
+    monkeypatch.setattr(summarization, "summarize", summarize)
+    return controller
+
+
+@pytest.mark.parametrize("max_items", [0, -1])
+def test_non_positive_max_items_is_rejected(max_items: int) -> None:
+    response = TestClient(main.app).post(
+        "/youtube-playlist-transcribe", json={"url": PLAYLIST_URL, "maxItems": max_items}
+    )
+
+    assert response.status_code == 422
+
+
+def test_playlist_transcribes_every_item_and_releases_admission(playlist) -> None:
+    response = TestClient(main.app).post(
+        "/youtube-playlist-transcribe",
+        json={"url": PLAYLIST_URL, "maxItems": 5, "combinedSummary": False},
+    )
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["transcript"] for item in items] == [f"https://youtu.be/v{n}" for n in range(5)]
+    for work_class in playlist.snapshot().values():
+        assert (work_class["admitted"], work_class["waiting"], work_class["in_flight"]) == (0, 0, 0)
+
+
+def test_playlist_is_shed_when_its_parallel_items_do_not_fit(playlist, monkeypatch) -> None:
+    controller = make_controller(limit=1, max_queue=1)
+    monkeypatch.setattr(main, "get_admission_controller", lambda: controller)
+
+    response = TestClient(main.app).post(
+        "/youtube-playlist-transcribe", json={"url": PLAYLIST_URL, "maxItems": 5}
+    )
+
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+    assert all(work_class["admitted"] == 0 for work_class in controller.snapshot().values())
+
+
+def test_extend_counts_parallel_items_until_they_start() -> None:
+    controller = make_controller(limit=2)
+    ticket = controller.admit(WORK)
+
+    controller.extend(2)
+    assert controller.snapshot()["stt"]["admitted"] == 3
+
+    ticket.start("stt")
+    ticket.start("stt")
+    assert controller.snapshot()["stt"]["admitted"] == 1
+    ticket.release()
+    assert all(work_class["admitted"] == 0 for work_class in controller.snapshot().values())
+
+
+def test_token_bucket_is_shared_between_threads() -> None:
+    bucket = TokenBucket(rate_bytes=100_000, burst_bytes=0)
+
+    def download() -> None:
+        for _ in range(2):
+            bucket.consume(10_000)
+
+    threads = [threading.Thread(target=download) for _ in range(2)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 40 KB at 100 KB/s, no matter how many threads share the bucket.
+    assert 0.35 <= time.monotonic() - started < 1.0
+
+
+def test_throttle_hook_charges_new_bytes_per_file() -> None:
+    charged = []
+
+    class Recorder(TokenBucket):
+        def consume(self, amount: int) -> None:
+            charged.append(amount)
+
+    hook = _throttle(Recorder(rate_bytes=1))
+    for progress in (
+        {"status": "downloading", "filename": "a", "downloaded_bytes": 100},
+        {"status": "downloading", "filename": "a", "downloaded_bytes": 250},
+        {"status": "downloading", "filename": "b", "downloaded_bytes": 50},
+        {"status": "finished", "filename": "a", "downloaded_bytes": 250},
+    ):
+        hook(progress)
+
+    assert charged == [100, 150, 50]
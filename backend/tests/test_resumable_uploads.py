@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+from app.options import RequestOptions
+from app.services import SegmentedTranscript, TempStorageManager
+from app.services.resumable_uploads import (
+    ContentRange,
+    ResumableUploadService,
+    UploadConflict,
+    UploadNotFound,
+    _write_range,
+    parse_content_range,
+)
+
+
+class FakeTranscription:
+    def __init__(self) -> None:
+        self.calls: List[Tuple[str, RequestOptions]] = []
+
+    async def transcribe_path(self, path: Path, options: RequestOptions) -> SegmentedTranscript:
+        self.calls.append((Path(path).name, options))
+        text = Path(path).read_bytes().decode()
+        return SegmentedTranscript.from_segments([(0.0, 1.0, text, None)])
+
+
+def make_service(root: Path, transcription: FakeTranscription) -> ResumableUploadService:
+    return ResumableUploadService(
+        TempStorageManager(root=str(root)),
+        transcription,  # type: ignore[arg-type]
+        max_upload_size_mb=1,
+        max_chunk_mb=1,
+    )
+
+
+def test_parse_content_range() -> None:
+    parsed = parse_content_range("bytes 0-99/200")
+
+    assert parsed == ContentRange(start=0, end=99, total=200)
+    assert parsed.length == 100
+    assert parse_content_range(" bytes 199-199/200 ").length == 1
+
+
+@pytest.mark.parametrize(
+    "value",
+    [None, "", "bytes 0-99", "bytes */200", "items 0-1/2", "bytes 5-4/10", "bytes 0-10/10"],
+)
+def test_parse_content_range_rejects_invalid_headers(value) -> None:
+    with pytest.raises(ValueError):
+        parse_content_range(value)
+
+
+def test_write_range_appends_consecutive_chunks(tmp_path: Path) -> None:
+    path = tmp_path / "data"
+
+    assert _write_range(path, parse_content_range("bytes 0-2/6"), b"abc") == 3
+    assert _write_range(path, parse_content_range("bytes 3-5/6"), b"def") == 6
+    assert path.read_bytes() == b"abcdef"
+
+
+def test_write_range_retry_with_overlap_writes_only_new_bytes(tmp_path: Path) -> None:
+    path = tmp_path / "data"
+    _write_range(path, parse_content_range("bytes 0-3/8"), b"abcd")
+
+    # Same chunk again, e.g. after a lost response: nothing changes.
+    assert _write_range(path, parse_content_range("bytes 0-3/8"), b"abcd") == 4
+    # A chunk that starts inside the stored data only contributes its tail.
+    assert _write_range(path, parse_content_range("bytes 2-5/8"), b"cdef") == 6
+    assert path.read_bytes() == b"abcdef"
+
+
+def test_write_range_with_gap_conflicts_at_current_offset(tmp_path: Path) -> None:
+    path = tmp_path / "data"
+    _write_range(path, parse_content_range("bytes 0-1/8"), b"ab")
+
+    with pytest.raises(UploadConflict) as excinfo:
+        _write_range(path, parse_content_range("bytes 4-5/8"), b"ef")
+
+    assert excinfo.value.offset == 2
+    assert path.read_bytes() == b"ab"
+
+
+def test_write_chunk_rejects_length_mismatch(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        service = make_service(tmp_path, FakeTranscription())
+        upload = await service.create("audio.mp3", size=8)
+
+        with pytest.raises(ValueError, match="Content-Range declares 4"):
+            await service.write_chunk(upload.upload_id, parse_content_range("bytes 0-3/8"), b"abc")
+        with pytest.raises(ValueError, match="upload size"):
+            await service.write_chunk(upload.upload_id, parse_content_range("bytes 0-3/9"), b"abcd")
+
+        status = await service.write_chunk(
+            upload.upload_id, parse_content_range("bytes 0-3/8"), b"abcd"
+        )
+        assert status.offset == 4 and not status.complete
+
+    asyncio.run(scenario())
+
+
+def test_adopted_upload_transcribes_with_stored_options(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        creator = make_service(tmp_path, FakeTranscription())
+        options = RequestOptions(provider="assemblyai", assembly_model="slam_1")
+        upload = await creator.create("audio.mp3", size=None, segmented=True, options=options)
+
+        transcription = FakeTranscription()
+        sibling = make_service(tmp_path, transcription)
+        await sibling.write_chunk(
+            upload.upload_id, parse_content_range("bytes 0-1/2"), b"hi", segment=0
+        )
+        await sibling.drain(timeout=5)
+
+        [(name, used)] = transcription.calls
+        assert (name, used.provider, used.assembly_model) == (
+            "segment-00000.mp3",
+            "assemblyai",
+            "slam_1",
+        )
+
+    asyncio.run(scenario())
+
+
+def test_adopted_upload_with_client_keys_leaves_segments_to_finalize(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        creator = make_service(tmp_path, FakeTranscription())
+        options = RequestOptions(api_key="client-key", stt_model="whisper-1")
+        upload = await creator.create("audio.mp3", size=None, segmented=True, options=options)
+
+        transcription = FakeTranscription()
+        sibling = make_service(tmp_path, transcription)
+        status = await sibling.write_chunk(
+            upload.upload_id, parse_content_range("bytes 0-1/2"), b"hi", segment=0
+        )
+        await sibling.drain(timeout=5)
+        assert transcription.calls == []
+        assert not status.segments[0].transcribed
+
+        finalize = sibling.finalize(upload.upload_id, RequestOptions(api_key="client-key"))
+        async with finalize as result:
+            assert result.text == "hi"
+        [(_, used)] = transcription.calls
+        assert (used.api_key, used.stt_model) == ("client-key", "whisper-1")
+
+    asyncio.run(scenario())
+
+
+async def upload_segments(service: ResumableUploadService, upload_id: str, *pieces: bytes) -> None:
+    for index, piece in enumerate(pieces):
+        content_range = parse_content_range(f"bytes 0-{len(piece) - 1}/{len(piece)}")
+        await service.write_chunk(upload_id, content_range, piece, segment=index)
+
+
+def test_two_workers_share_segment_declarations(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        first = make_service(tmp_path, FakeTranscription())
+        second = make_service(tmp_path, FakeTranscription())
+        upload = await first.create("audio.mp3", size=None, segmented=True)
+        one = parse_content_range("bytes 0-1/2")
+
+        await first.write_chunk(upload.upload_id, one, b"b.", segment=1)
+        await second.write_chunk(upload.upload_id, one, b"a.", segment=0)
+
+        for service in (first, second):
+            status = await service.status(upload.upload_id)
+            assert [segment.index for segment in status.segments] == [0, 1]
+        async with first.finalize(upload.upload_id, RequestOptions(), segment_count=2) as result:
+            assert result.text == "a. b."
+
+    asyncio.run(scenario())
+
+
+def test_finalize_claim_excludes_other_workers(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        first = make_service(tmp_path, FakeTranscription())
+        second = make_service(tmp_path, FakeTranscription())
+        upload = await first.create("audio.mp3", size=2)
+        await first.write_chunk(upload.upload_id, parse_content_range("bytes 0-1/2"), b"hi")
+
+        async with first.finalize(upload.upload_id, RequestOptions()):
+            with pytest.raises(UploadConflict, match="already being finalized"):
+                async with second.finalize(upload.upload_id, RequestOptions()):
+                    pass
+            with pytest.raises(UploadConflict):
+                await second.discard(upload.upload_id)
+            with pytest.raises(UploadConflict):
+                await second.write_chunk(
+                    upload.upload_id, parse_content_range("bytes 0-1/2"), b"hi"
+                )
+
+        for service in (first, second):
+            with pytest.raises(UploadNotFound):
+                await service.status(upload.upload_id)
+
+    asyncio.run(scenario())
+
+
+def test_discard_by_another_worker_is_not_found_everywhere(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        first = make_service(tmp_path, FakeTranscription())
+        second = make_service(tmp_path, FakeTranscription())
+        upload = await first.create("audio.mp3", size=4)
+        await second.status(upload.upload_id)
+
+        await second.discard(upload.upload_id)
+
+        with pytest.raises(UploadNotFound):
+            await first.status(upload.upload_id)
+        with pytest.raises(UploadNotFound):
+            await first.write_chunk(upload.upload_id, parse_content_range("bytes 0-3/4"), b"abcd")
+        assert not any(tmp_path.iterdir())
+
+    asyncio.run(scenario())
+
+
+def test_failed_finalize_keeps_the_upload(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        service = make_service(tmp_path, FakeTranscription())
+        upload = await service.create("audio.mp3", size=None, segmented=True)
+        await upload_segments(service, upload.upload_id, b"hi")
+
+        with pytest.raises(RuntimeError):
+            async with service.finalize(upload.upload_id, RequestOptions()):
+                raise RuntimeError("summarization failed")
+
+        async with service.finalize(upload.upload_id, RequestOptions()) as result:
+            assert result.text == "hi"
+        with pytest.raises(UploadNotFound):
+            await service.status(upload.upload_id)
+
+    asyncio.run(scenario())
+
+
+def test_finalize_checks_segment_digest_and_count(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        service = make_service(tmp_path, FakeTranscription())
+        digest = hashlib.sha256(b"onetwo").hexdigest()
+        good = await service.create("audio.mp3", size=None, sha256=digest, segmented=True)
+        bad = await service.create("audio.mp3", size=None, sha256=digest, segmented=True)
+        await upload_segments(service, good.upload_id, b"one", b"two")
+        await upload_segments(service, bad.upload_id, b"two", b"one")
+
+        with pytest.raises(ValueError, match="beyond segment_count"):
+            async with service.finalize(good.upload_id, RequestOptions(), segment_count=1):
+                pass
+        with pytest.raises(ValueError, match="sha256"):
+            async with service.finalize(bad.upload_id, RequestOptions()):
+                pass
+        async with service.finalize(good.upload_id, RequestOptions()) as result:
+            assert result.text == "one two"
+
+    asyncio.run(scenario())
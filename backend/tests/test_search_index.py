@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from app.services import search_index
+from app.services.search_index import SearchIndex, build_snippet, parse_query
+
+DOCUMENTS = {
+    "fox": "The quick brown fox jumps over the lazy dog.",
+    "dog": "A lazy brown dog sleeps all day.",
+    "cat": "The cat watches the quick fox from the window.",
+    "report": "Quarterly report: revenue grew while costs stayed flat.",
+}
+
+
+def build_index(documents=DOCUMENTS) -> SearchIndex:
+    index = SearchIndex()
+    for session_id, text in documents.items():
+        index.add(session_id, text)
+    return index
+
+
+def ids(matches) -> set[str]:
+    return {match.session_id for match in matches}
+
+
+def test_search_requires_every_term() -> None:
+    index = build_index()
+
+    assert ids(index.search("brown")) == {"fox", "dog"}
+    assert ids(index.search("quick fox")) == {"fox", "cat"}
+    assert ids(index.search("brown cat")) == set()
+    assert index.search("unknown") == []
+
+
+def test_search_ranks_denser_matches_first() -> None:
+    index = build_index({"short": "fox fox fox", "long": "fox " + "filler " * 50})
+
+    assert [match.session_id for match in index.search("fox")] == ["short", "long"]
+
+
+def test_search_within_only_returns_named_sessions() -> None:
+    index = build_index()
+
+    assert ids(index.search("brown", within=["dog", "report", "missing"])) == {"dog"}
+    assert index.search("brown", within=[]) == []
+
+
+def test_phrase_requires_adjacent_words_in_order() -> None:
+    index = build_index()
+
+    assert ids(index.search('"quick brown"')) == {"fox"}
+    assert ids(index.search('"brown quick"')) == set()
+    assert ids(index.search('"lazy dog"')) == {"fox"}
+    assert ids(index.search('"lazy dog" sleeps')) == set()
+
+
+def test_parse_query_splits_terms_and_phrases() -> None:
+    parsed = parse_query('revenue "costs stayed" "Flat"')
+
+    assert parsed.terms == ["revenue", "flat"]
+    assert parsed.phrases == [["costs", "stayed"]]
+    assert parsed.all_terms == ["revenue", "flat", "costs", "stayed"]
+
+
+def test_remove_and_readd_replace_the_document() -> None:
+    index = build_index()
+
+    index.remove(["fox"])
+    assert ids(index.search("quick")) == {"cat"}
+    assert len(index) == 3
+
+    index.add("cat", "Nothing quick here any more.")
+    index.add("cat", "A completely different text.")
+    assert index.search("quick") == []
+    assert ids(index.search("different")) == {"cat"}
+
+
+def test_compact_drops_tombstones_and_keeps_positions() -> None:
+    index = build_index()
+    index.remove(["fox", "report"])
+
+    index.compact()
+
+    assert not index._deleted
+    for postings in index._terms.values():
+        assert len(postings.docs) == len(postings.offsets)
+        assert list(postings.docs) == sorted(postings.docs)
+        assert not set(postings.docs) & {0, 3}
+    assert "revenue" not in index._terms
+    assert ids(index.search('"quick fox"')) == {"cat"}
+    assert ids(index.search('"lazy brown dog"')) == {"dog"}
+
+
+def test_removal_past_threshold_compacts_in_background(monkeypatch) -> None:
+    monkeypatch.setattr(search_index, "_COMPACT_MIN_DELETED", 2)
+    index = build_index()
+
+    index.remove(["fox", "dog", "cat"])
+    for thread in threading.enumerate():
+        if thread.name == "search-index-compact":
+            thread.join(timeout=5)
+
+    assert not index._deleted
+    assert not index._compacting
+    assert ids(index.search("report")) == {"report"}
+
+
+def test_idf_ignores_tombstoned_documents() -> None:
+    index = build_index()
+    index.remove(["dog"])
+    fresh = build_index({key: text for key, text in DOCUMENTS.items() if key != "dog"})
+
+    tombstoned = {match.session_id: match.score for match in index.search("brown")}
+    expected = {match.session_id: match.score for match in fresh.search("brown")}
+
+    assert tombstoned == pytest.approx(expected)
+    index.compact()
+    compacted = {match.session_id: match.score for match in index.search("brown")}
+    assert compacted == pytest.approx(expected)
+
+
+def test_build_snippet_centres_on_first_match() -> None:
+    text = " ".join(f"word{number}" for number in range(200))
+    snippet = build_snippet(text, parse_query("word100"), width=40)
+
+    assert "word100" in snippet
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert len(snippet) <= 42
+
+
+def test_build_snippet_prefers_phrase_and_falls_back_to_prefix() -> None:
+    text = "Brown bears roam. Later the quick brown fox appears."
+
+    assert build_snippet(text, parse_query('"quick brown"'), width=20).startswith("…")
+    assert "quick brown" in build_snippet(text, parse_query('"quick brown"'), width=20)
+    assert build_snippet(text, parse_query("absent"), width=11) == "Brown bears"
+    assert build_snippet("", parse_query("fox")) == ""
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+
+from app.services import SegmentedTranscript
+from app.services import segments as segments_module
+
+
+def make_transcript() -> SegmentedTranscript:
+    return SegmentedTranscript.from_segments(
+        [
+            (0.0, 1.5, "Hello there.", "A"),
+            (1.5, 3.25, "Line one\n\n\nline two --> still text", None),
+            (3725.0, 3726.004, "Tom & <Jerry>", "B"),
+        ]
+    )
+
+
+def test_srt_export() -> None:
+    srt = "".join(make_transcript().iter_srt())
+
+    assert srt == (
+        "1\n00:00:00,000 --> 00:00:01,500\nA: Hello there.\n\n"
+        "2\n00:00:01,500 --> 00:00:03,250\nLine one\nline two -> still text\n\n"
+        "3\n01:02:05,000 --> 01:02:06,004\nB: Tom & <Jerry>\n\n"
+    )
+
+
+def test_srt_cues_stay_intact_with_blank_lines_and_arrows() -> None:
+    srt = "".join(make_transcript().iter_srt())
+    cues = srt.strip("\n").split("\n\n")
+
+    assert len(cues) == 3
+    for cue in cues:
+        assert cue.count("-->") == 1
+
+
+def test_vtt_export() -> None:
+    vtt = "".join(make_transcript().iter_vtt())
+
+    assert vtt == (
+        "WEBVTT\n\n"
+        "00:00:00.000 --> 00:00:01.500\n<v A>Hello there.\n\n"
+        "00:00:01.500 --> 00:00:03.250\nLine one\nline two --&gt; still text\n\n"
+        "01:02:05.000 --> 01:02:06.004\n<v B>Tom &amp; &lt;Jerry&gt;\n\n"
+    )
+
+
+def test_json_export_round_trips_and_keeps_non_ascii_text() -> None:
+    transcript = SegmentedTranscript.from_segments([(0.0, 1.0, "Grüße, 世界", None)])
+    body = "".join(transcript.iter_json("abc", "Zusammenfassung: schön"))
+
+    assert "\\u" not in body
+    assert json.loads(body) == {
+        "session_id": "abc",
+        "summary": "Zusammenfassung: schön",
+        "has_timestamps": True,
+        "segments": [{"start": 0.0, "end": 1.0, "text": "Grüße, 世界"}],
+    }
+
+
+def test_untimed_transcript_exports_json_with_one_segment() -> None:
+    body = "".join(SegmentedTranscript.from_text("plain text").iter_json("id", ""))
+
+    payload = json.loads(body)
+    assert payload["has_timestamps"] is False
+    assert [segment["text"] for segment in payload["segments"]] == ["plain text"]
+
+
+def test_exports_are_chunked_without_changing_content(monkeypatch) -> None:
+    monkeypatch.setattr(segments_module, "EXPORT_CHUNK_CHARS", 64)
+    transcript = SegmentedTranscript.from_segments(
+        (float(number), number + 1.0, f"cue {number}", None) for number in range(50)
+    )
+
+    chunks = list(transcript.iter_srt())
+    monkeypatch.setattr(segments_module, "EXPORT_CHUNK_CHARS", 1 << 30)
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == "".join(transcript.iter_srt())
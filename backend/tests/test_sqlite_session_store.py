@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from app.services import SearchIndex, SqliteSessionStore
+from app.services import sqlite_session_store
+
+
+def wait_for_sync() -> None:
+    for thread in threading.enumerate():
+        if thread.name == "session-index-sync":
+            thread.join(timeout=5)
+
+
+def test_search_sees_sessions_created_by_another_worker(tmp_path: Path) -> None:
+    path = str(tmp_path / "sessions.db")
+    searcher = SqliteSessionStore(path, search_index=SearchIndex())
+    writer = SqliteSessionStore(path)
+    wait_for_sync()
+
+    session_id = writer.create("The quick brown fox.", "A fox.")
+
+    [result] = searcher.search("fox", within=[session_id])
+    assert result.session_id == session_id
+
+
+def test_backlog_is_indexed_in_background_batches(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(sqlite_session_store, "_SYNC_BATCH", 2)
+    path = str(tmp_path / "sessions.db")
+    writer = SqliteSessionStore(path)
+    session_ids = [writer.create(f"Transcript number {number}.", "") for number in range(7)]
+
+    searcher = SqliteSessionStore(path, search_index=SearchIndex())
+    searcher.search("transcript", within=session_ids)
+    wait_for_sync()
+
+    assert not searcher._syncing
+    assert len(searcher._index) == 7
+    assert {result.session_id for result in searcher.search("transcript", within=session_ids)} == (
+        set(session_ids)
+    )
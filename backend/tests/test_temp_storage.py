@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services import StorageQuotaExceeded, TempStorageManager
+from app.services.temp_storage import _last_modified
+
+MB = 1024 * 1024
+
+
+def make_manager(root: Path, quota_mb: int = 10) -> TempStorageManager:
+    return TempStorageManager(root=str(root), quota_mb=quota_mb, usage_cache_seconds=0)
+
+
+def test_reservations_count_against_quota(tmp_path: Path) -> None:
+    manager = make_manager(tmp_path)
+    lease = manager.acquire("upload", 6 * MB)
+
+    with pytest.raises(StorageQuotaExceeded):
+        manager.acquire("upload", 6 * MB)
+
+    lease.release()
+    manager.acquire("upload", 6 * MB)
+
+
+def test_reservations_of_other_workers_count_against_quota(tmp_path: Path) -> None:
+    first = make_manager(tmp_path)
+    second = make_manager(tmp_path)
+    lease = first.acquire_named("resumable-a", "resumable", 6 * MB)
+
+    with pytest.raises(StorageQuotaExceeded):
+        second.acquire("upload", 6 * MB)
+    with pytest.raises(StorageQuotaExceeded):
+        second.check_admission(6 * MB)
+
+    lease.release()
+    second.acquire("upload", 6 * MB)
+
+
+def test_written_files_count_when_larger_than_reservation(tmp_path: Path) -> None:
+    first = make_manager(tmp_path)
+    second = make_manager(tmp_path)
+    lease = first.acquire("download", 1 * MB)
+    lease.new_file(".part").write_bytes(b"\0" * (6 * MB))
+
+    with pytest.raises(StorageQuotaExceeded):
+        second.acquire("upload", 6 * MB)
+    second.acquire("upload", 3 * MB)
+
+
+def test_last_modified_sees_nested_writes(tmp_path: Path) -> None:
+    lease = tmp_path / "tb-download"
+    nested = lease / "tmpabc"
+    nested.mkdir(parents=True)
+    old = time.time() - 3600
+    for path in (lease, nested):
+        os.utime(path, (old, old))
+
+    assert _last_modified(lease) == pytest.approx(old)
+    (nested / "video.part").write_bytes(b"data")
+    os.utime(nested, (old, old))
+
+    assert _last_modified(lease) > old + 3000
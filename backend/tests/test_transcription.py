@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from app.config import settings
+from app.options import RequestOptions
+from app.services import (
+    ProviderRouter,
+    SegmentedTranscript,
+    TranscriptionError,
+    TranscriptionService,
+)
+from app.services.transcription import _is_transient
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def make_router(**overrides) -> ProviderRouter:
+    values = dict(
+        failover=True,
+        hedge=False,
+        hedge_percentile=0.95,
+        hedge_min_delay=0.0,
+        hedge_default_delay=30.0,
+        failure_threshold=2,
+        cooldown_seconds=30.0,
+    )
+    values.update(overrides)
+    return ProviderRouter(**values)
+
+
+class FakeProvider:
+    def __init__(self, name: str, error: Exception | None = None, delay: float = 0.0) -> None:
+        self.name = name
+        self.error = error
+        self.delay = delay
+        self.calls: List[RequestOptions] = []
+
+    def __call__(self, path: Path, options: RequestOptions) -> SegmentedTranscript:
+        self.calls.append(options)
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return SegmentedTranscript.from_text(self.name)
+
+
+@pytest.fixture
+def audio(tmp_path: Path) -> Path:
+    path = tmp_path / "audio.mp3"
+    path.write_bytes(b"audio")
+    return path
+
+
+@pytest.fixture(autouse=True)
+def server_keys(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "openai_api_key", "server-openai")
+    monkeypatch.setattr(settings, "assemblyai_api_key", "server-assemblyai")
+
+
+def make_service(router: ProviderRouter, openai: FakeProvider, assemblyai: FakeProvider):
+    service = TranscriptionService(router=router)
+    service._transcribe_with_openai = openai  # type: ignore[method-assign]
+    service._transcribe_with_assemblyai = assemblyai  # type: ignore[method-assign]
+    return service
+
+
+def transient(message: str = "provider down") -> TranscriptionError:
+    return TranscriptionError(message, transient=True)
+
+
+@pytest.mark.parametrize(
+    "exc, expected",
+    [
+        (StatusError(500), True),
+        (StatusError(503), True),
+        (StatusError(429), True),
+        (StatusError(400), False),
+        (StatusError(401), False),
+        (TimeoutError(), True),
+        (ConnectionResetError(), True),
+        (ValueError("bad audio"), False),
+    ],
+)
+def test_is_transient(exc: Exception, expected: bool) -> None:
+    assert _is_transient(exc) is expected
+
+
+def test_transient_error_fails_over_and_counts_against_breaker(audio: Path) -> None:
+    router = make_router()
+    openai, assemblyai = FakeProvider("openai", transient()), FakeProvider("assemblyai")
+    service = make_service(router, openai, assemblyai)
+
+    result = asyncio.run(service.transcribe_path(audio, RequestOptions(provider="openai")))
+
+    assert result.text == "assemblyai"
+    assert router.snapshot()["openai"]["error_rate"] == 1.0
+
+
+def test_request_error_neither_fails_over_nor_trips_breaker(audio: Path) -> None:
+    router = make_router(failure_threshold=1)
+    openai = FakeProvider("openai", TranscriptionError("invalid api key"))
+    assemblyai = FakeProvider("assemblyai")
+    service = make_service(router, openai, assemblyai)
+
+    with pytest.raises(TranscriptionError, match="invalid api key"):
+        asyncio.run(service.transcribe_path(audio, RequestOptions(provider="openai")))
+
+    assert assemblyai.calls == []
+    assert router.snapshot().get("openai", {}).get("samples", 0) == 0
+    assert router.order(["openai", "assemblyai"]) == ["openai", "assemblyai"]
+
+
+def test_client_key_never_fails_over_to_server_key(audio: Path) -> None:
+    openai, assemblyai = FakeProvider("openai", transient()), FakeProvider("assemblyai")
+    service = make_service(make_router(), openai, assemblyai)
+
+    with pytest.raises(TranscriptionError, match="provider down"):
+        asyncio.run(
+            service.transcribe_path(audio, RequestOptions(provider="openai", api_key="client"))
+        )
+
+    assert assemblyai.calls == []
+
+
+def test_client_keys_for_both_providers_allow_failover(audio: Path) -> None:
+    openai, assemblyai = FakeProvider("openai", transient()), FakeProvider("assemblyai")
+    service = make_service(make_router(), openai, assemblyai)
+    options = RequestOptions(provider="openai", api_key="client", assembly_api_key="client-aai")
+
+    assert asyncio.run(service.transcribe_path(audio, options)).text == "assemblyai"
+    assert assemblyai.calls[0].assembly_api_key == "client-aai"
+
+
+def test_file_too_large_for_openai_is_routed_to_assemblyai(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "long.mp3"
+    with path.open("wb") as handle:
+        handle.truncate(26 * 1024 * 1024)
+    openai, assemblyai = FakeProvider("openai"), FakeProvider("assemblyai")
+    service = make_service(make_router(), openai, assemblyai)
+
+    assert asyncio.run(service.transcribe_path(path, RequestOptions(provider="openai"))).text == (
+        "assemblyai"
+    )
+    assert openai.calls == []
+
+    monkeypatch.setattr(settings, "assemblyai_api_key", None)
+    with pytest.raises(TranscriptionError, match="at most 25 MB"):
+        asyncio.run(service.transcribe_path(path, RequestOptions(provider="openai")))
+    assert openai.calls == []
+
+
+def test_breaker_opens_then_closes_after_successful_trial() -> None:
+    router = make_router(failure_threshold=2, cooldown_seconds=0.05)
+    router.record_failure("openai")
+    assert router.order(["openai", "assemblyai"]) == ["openai", "assemblyai"]
+
+    router.record_failure("openai")
+    assert router.snapshot()["openai"]["circuit"] == "open"
+    assert router.order(["openai", "assemblyai"]) == ["assemblyai", "openai"]
+
+    time.sleep(0.06)
+    assert router.order(["openai", "assemblyai"]) == ["openai", "assemblyai"]
+    assert router.acquire("openai") is True
+    # Only one trial request at a time.
+    assert router.order(["openai", "assemblyai"]) == ["assemblyai", "openai"]
+
+    router.record_success("openai", elapsed=1.0, size_mb=1.0)
+    assert router.snapshot()["openai"]["circuit"] == "closed"
+    assert router.acquire("openai") is False
+
+
+def test_failed_trial_reopens_breaker() -> None:
+    router = make_router(failure_threshold=1, cooldown_seconds=0.0)
+    router.record_failure("openai")
+    assert router.acquire("openai") is True
+
+    router.record_failure("openai")
+
+    assert router.snapshot()["openai"]["circuit"] == "open"
+
+
+def test_slow_provider_is_hedged(audio: Path) -> None:
+    router = make_router(hedge=True, hedge_default_delay=0.05)
+    openai = FakeProvider("openai", delay=0.5)
+    assemblyai = FakeProvider("assemblyai")
+    service = make_service(router, openai, assemblyai)
+
+    async def scenario() -> float:
+        started = time.monotonic()
+        result = await service.transcribe_path(audio, RequestOptions(provider="openai"))
+        assert result.text == "assemblyai"
+        return time.monotonic() - started
+
+    assert asyncio.run(scenario()) < 0.4
+    assert len(openai.calls) == 1 and len(assemblyai.calls) == 1